@@ -0,0 +1,5 @@
+import sys
+from varieties.cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+Catalogue of the models found by mace4, up to isomorphism (and optionally anti-isomorphism).
+
+The * table of each interpretation in the output files is packed into bytes (one byte per entry,
+row by row), brought to a canonical form, and each distinct canonical table is stored once.
+The canonical form is the smallest relabelled table over the leaves of an individualisation-
+refinement search: the elements are coloured by isomorphism invariants, the colouring is
+refined until it is stable, and when it does not tell all the elements apart, each element of
+the first smallest colour class is picked out in turn.  Branches that an automorphism found so
+far maps onto one already searched are skipped, and when a leaf gives the same table as the best
+leaf, the automorphism between them maps a subtree already searched onto the one being searched,
+so the search jumps back to the node where the paths to the two leaves split.
+
+The catalogue file (little-endian) is laid out so that it can be mmap-ed:
+    header:  b"VCAT", version (u16), flags (u16, 1 = up to anti-isomorphism),
+             number of models (u32), number of problems (u32), offset of the index (u64)
+    offsets: offset of each model (u64)
+    models:  order n (u8) followed by the n * n canonical table
+    index:   for each problem, model id (u32), anti-isomorphic flag (u8),
+             length of the name (u16) and the name (utf-8) of the output file without .out
+
+e.g. varieties catalogue build models.cat outputs [more outputs ...] [--anti]
+     varieties catalogue show models.cat [problem ...]
+"""
+
+import os
+import re
+import sys
+import mmap
+import struct
+from varieties import profiling
+
+
+magic = b"VCAT"
+version = 1
+header_format = "<4sHHIIQ"
+interpretation_re = re.compile(r"interpretation\(\s*(\d+),.*?function\(\*\(_,_\),\s*\[([\d,\s]*)\]\)", re.S)
+
+
+def parse_models(file_path):
+    """ the * tables of the interpretations in a mace4 output file
+    Args:
+        file_path (str): full path name of the output file
+    Returns:
+        (List[tuple]): (order, packed table) of each model
+    """
+    with profiling.phase("read"):
+        with (open(file_path)) as fp:
+            text = fp.read()
+    with profiling.phase("parse"):
+        models = list()
+        for m in interpretation_re.finditer(text):
+            n = int(m.group(1))
+            entries = [int(entry) for entry in m.group(2).replace(",", " ").split()]
+            if len(entries) == n * n and n < 256:
+                models.append((n, bytes(entries)))
+    return models
+
+
+def transpose(n, table):
+    return bytes(table[y * n + x] for x in range(n) for y in range(n))
+
+
+def rank(signatures):
+    """ turns signatures into colours, numbered in the order of the signatures """
+    order = {signature: colour for colour, signature in enumerate(sorted(set(signatures)))}
+    return [order[signature] for signature in signatures]
+
+
+def invariants(n, table):
+    """ the initial colouring of the elements by isomorphism invariants """
+    signatures = list()
+    for x in range(n):
+        xx = table[x * n + x]
+        row = sorted((table[x * n + y] == x, table[x * n + y] == y, table[y * n + x] == x,
+                      table[y * n + x] == y, table[x * n + y] == table[y * n + x]) for y in range(n))
+        signatures.append((xx == x, table[xx * n + x] == xx, tuple(row)))
+    return rank(signatures)
+
+
+def refine(n, table, colours):
+    """ refines the colouring until it is stable: two elements keep the same colour only if they
+        have the same multiset of (colour of y, colour of x * y, colour of y * x) over all y
+    """
+    count = len(set(colours))
+    while True:
+        signatures = [(colours[x], colours[table[x * n + x]],
+                       tuple(sorted((colours[y], colours[table[x * n + y]], colours[table[y * n + x]])
+                                    for y in range(n))))
+                      for x in range(n)]
+        colours = rank(signatures)
+        new_count = len(set(colours))
+        if new_count == count:
+            return colours
+        count = new_count
+
+
+def relabel(n, table, labels):
+    """ the table with each element x renamed to labels[x] """
+    new_table = bytearray(n * n)
+    for x in range(n):
+        for y in range(n):
+            new_table[labels[x] * n + labels[y]] = labels[table[x * n + y]]
+    return bytes(new_table)
+
+
+def orbits(n, automorphisms):
+    """ the orbit of each element under the group generated by the automorphisms """
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for g in automorphisms:
+        for x in range(n):
+            parent[find(x)] = find(g[x])
+    return [find(x) for x in range(n)]
+
+
+def canonical_form(n, table):
+    """ the canonical form of a table under isomorphism
+    Args:
+        n (int): order
+        table (bytes): packed * table
+    Returns:
+        (bytes): the canonical packed table
+    """
+    best = [None, None, None]   # smallest table, the labels giving it, and the path to it
+    automorphisms = list()
+
+    def search(colours, prefix):
+        """ searches the subtree of a node, and returns the depth to jump back to: the depth of the
+            node itself, or less when the subtree turns out to be the image of one already searched
+        """
+        colours = refine(n, table, colours)
+        if len(set(colours)) == n:
+            candidate = relabel(n, table, colours)
+            if best[0] is None or candidate < best[0]:
+                best[0], best[1], best[2] = candidate, colours, prefix
+                return len(prefix)
+            if candidate == best[0]:
+                inverse = [0] * n
+                for x in range(n):
+                    inverse[best[1][x]] = x
+                automorphisms.append([inverse[colours[x]] for x in range(n)])
+                # the automorphism maps the subtree of the best leaf below the node where the two paths
+                # split onto the subtree of this leaf, so the rest of this subtree has nothing new
+                common = 0
+                while common < len(prefix) and prefix[common] == best[2][common]:
+                    common += 1
+                return common
+            return len(prefix)
+        cells = dict()
+        for x in range(n):
+            cells.setdefault(colours[x], list()).append(x)
+        cell = min(cells.values(), key=lambda members: (len(members) == 1, len(members), colours[members[0]]))
+        searched = list()
+        known = -1      # number of automorphisms the orbits were computed from
+        for v in cell:
+            if known != len(automorphisms):
+                known = len(automorphisms)
+                orbit = orbits(n, [g for g in automorphisms if all(g[x] == x for x in prefix)])
+            if any(orbit[v] == orbit[w] for w in searched):
+                continue
+            searched.append(v)
+            depth = search(rank([(2 * colours[x] + (0 if x == v else 1)) for x in range(n)]), prefix + [v])
+            if depth < len(prefix):
+                return depth
+        return len(prefix)
+
+    search(invariants(n, table), [])
+    return best[0]
+
+
+def canonical_key(n, table, anti=False):
+    """ the catalogue key of a model, and whether it is the transpose of the table that gives it
+    Args:
+        n (int): order
+        table (bytes): packed * table
+        anti (bool): whether to identify anti-isomorphic models
+    Returns:
+        (tuple): (key, anti-isomorphic flag)
+    """
+    key = bytes([n]) + canonical_form(n, table)
+    if anti:
+        anti_key = bytes([n]) + canonical_form(n, transpose(n, table))
+        if anti_key < key:
+            return (anti_key, True)
+    return (key, False)
+
+
+def build_catalogue(out_dirs, catalogue_file, anti=False):
+    """ builds the catalogue from all the models in the output directories
+    Args:
+        out_dirs (List[str]): directories of mace4 output files
+        catalogue_file (str): full path name of the catalogue to write
+        anti (bool): whether to identify anti-isomorphic models
+    Returns:
+        (tuple): (number of distinct models, number of problems)
+    """
+    keys = dict()       # key -> model id
+    index = list()      # (problem, model id, anti-isomorphic flag)
+    for out_dir in out_dirs:
+        for file in sorted(os.listdir(out_dir)):
+            if not file.endswith(".out"):
+                continue
+            models = parse_models(os.path.join(out_dir, file))
+            if not models:
+                continue
+            with profiling.phase("canonical"):
+                key, flipped = canonical_key(*models[0], anti)
+                model_id = keys.setdefault(key, len(keys))
+            index.append((file[:-len(".out")], model_id, flipped))
+    with profiling.phase("write"):
+        write_catalogue(catalogue_file, list(keys), index, anti)
+    return (len(keys), len(index))
+
+
+def write_catalogue(catalogue_file, keys, index, anti):
+    header_size = struct.calcsize(header_format)
+    offsets = list()
+    position = header_size + 8 * len(keys)
+    for key in keys:
+        offsets.append(position)
+        position += len(key)
+    entries = b"".join(struct.pack("<IBH", model_id, flipped, len(name.encode("utf-8"))) + name.encode("utf-8")
+                       for name, model_id, flipped in index)
+    tmp = f"{catalogue_file}.{os.getpid()}.tmp"
+    with (open(tmp, "wb")) as fp:
+        fp.write(struct.pack(header_format, magic, version, 1 if anti else 0, len(keys), len(index), position))
+        fp.write(struct.pack(f"<{len(keys)}Q", *offsets))
+        fp.writelines(keys)
+        fp.write(entries)
+    os.replace(tmp, catalogue_file)
+
+
+def read_catalogue(catalogue_file):
+    """ reads a catalogue into memory
+    Args:
+        catalogue_file (str): full path name of the catalogue
+    Returns:
+        (tuple): (list of (order, packed canonical table) of each model,
+                  dict of problem -> (model id, anti-isomorphic flag), whether anti-isomorphic
+                  models are identified)
+    """
+    with (open(catalogue_file, "rb")) as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        file_magic, file_version, flags, model_count, index_count, index_offset = struct.unpack_from(header_format, mm, 0)
+        if file_magic != magic or file_version != version:
+            raise ValueError(f"{catalogue_file} is not a version {version} model catalogue")
+        offsets = struct.unpack_from(f"<{model_count}Q", mm, struct.calcsize(header_format))
+        models = [(mm[offset], bytes(mm[offset + 1 : offset + 1 + mm[offset] ** 2])) for offset in offsets]
+        index = dict()
+        position = index_offset
+        for _ in range(index_count):
+            model_id, flipped, length = struct.unpack_from("<IBH", mm, position)
+            position += struct.calcsize("<IBH")
+            index[mm[position : position + length].decode("utf-8")] = (model_id, bool(flipped))
+            position += length
+    return (models, index, bool(flags & 1))
+
+
+def format_table(n, table):
+    return "\n".join(" ".join(str(entry) for entry in table[x * n : (x + 1) * n]) for x in range(n))
+
+
+def show_catalogue(catalogue_file, problems):
+    """ prints the models of the given problems, or a summary of all the models """
+    models, index, anti = read_catalogue(catalogue_file)
+    if problems:
+        for problem in problems:
+            if problem not in index:
+                print(f"{problem}: not in {catalogue_file}", file=sys.stderr)
+                continue
+            model_id, flipped = index[problem]
+            n, table = models[model_id]
+            print(f"{problem}: model {model_id} of order {n}{' (anti-isomorphic)' if flipped else ''}")
+            print(format_table(n, table))
+        return
+    users = dict()
+    for model_id, _ in index.values():
+        users[model_id] = users.get(model_id, 0) + 1
+    print(f"{len(models)} models for {len(index)} problems{', up to anti-isomorphism' if anti else ''}")
+    for model_id, (n, table) in enumerate(models):
+        print(f"model {model_id}: order {n}, {users.get(model_id, 0)} problems")
+
+
+def main(argv):
+    argv = profiling.start(argv)
+    anti = "--anti" in argv
+    argv = [arg for arg in argv if arg != "--anti"]
+    if len(argv) > 2 and argv[0] == "build":
+        model_count, problem_count = build_catalogue(argv[2:], argv[1], anti)
+        print(f"{model_count} distinct models for {problem_count} problems written to {argv[1]}")
+    elif len(argv) > 1 and argv[0] == "show":
+        show_catalogue(argv[1], argv[2:])
+    else:
+        print("usage: catalogue build <catalogue file> <output dir> ... [--anti] | show <catalogue file> [problem ...]")
+    profiling.stop()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
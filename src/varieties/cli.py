@@ -0,0 +1,103 @@
+"""
+Single entry point for all the pipelines:
+
+    varieties generate <family> ...   generate the Mace4 inputs files of a family
+    varieties run <family> inputs_dir outputs_dir [spreadsheet]
+    varieties collect <family> ...    collect the results from the Mace4 output files
+    varieties catalogue build|show ...   catalogue of the models found, up to isomorphism
+    varieties batch [file]            run many of the above commands, one per line, in one process
+
+The modules of a family are only imported when a command needs them, so that startup
+stays fast when the scripts are called many times from orchestration scripts.
+"""
+
+import sys
+from importlib import import_module
+
+
+commands = {
+    "generate": {"bands": "varieties.formula_gen",
+                 "semi": "varieties.semi.gen_formulas",
+                 "groups": "varieties.groups.gen_formulas",
+                 "epigroup": "varieties.epigroup.gen_formulas",
+                 "nilpotent_monoid2": "varieties.nilpotent_monoid2.gen_formulas"},
+    "run": {"bands": "varieties.runner",
+            "semi": "varieties.semi.run_variety",
+            "groups": "varieties.runner",
+            "epigroup": "varieties.runner",
+            "nilpotent_monoid2": "varieties.runner"},
+    "collect": {"semi": "varieties.semi.collect"},
+}
+
+usage = """usage: varieties generate|run|collect <family> [args ...]
+       varieties catalogue build <catalogue file> <output dir> ... [--anti]
+       varieties catalogue show <catalogue file> [problem ...]
+       varieties batch [file]
+"""
+
+
+def run_command(argv):
+    """ runs one command, e.g. ["generate", "semi", "docs/semi.xlsx", "229", "300", "inputs"]
+    Args:
+        argv (List[str]): command, family, followed by the arguments of the family's script,
+                          or catalogue followed by its arguments
+    Returns:
+        (int): 0 on success, 2 on a usage error
+    """
+    if argv and argv[0] == "catalogue":
+        import_module("varieties.catalogue").main(argv[1:])
+        return 0
+    if len(argv) < 2 or argv[0] not in commands:
+        print(usage, end="", file=sys.stderr)
+        return 2
+    command, family = argv[0], argv[1]
+    module_name = commands[command].get(family, None)
+    if module_name is None:
+        print(f"no {command} for {family}, choose from {', '.join(commands[command])}.", file=sys.stderr)
+        return 2
+    import_module(module_name).main(argv[2:])
+    return 0
+
+
+def run_batch(fp):
+    """ runs many commands in one process, one command per line; blank lines and lines
+        starting with # are skipped.  A command that fails is reported with its line number,
+        and the batch goes on with the next line.
+    Args:
+        fp (file): file with the commands
+    Returns:
+        (int): 0 if all commands succeeded, otherwise the status of the last failing command
+               (1 for a command that raised an error, 2 for a usage error)
+    """
+    import shlex
+    status = 0
+    for line_no, line in enumerate(fp, start=1):
+        try:
+            argv = shlex.split(line, comments=True)
+            if argv:
+                command_status = run_command(argv)
+            else:
+                command_status = 0
+        except Exception as e:
+            print(f"line {line_no}: {line.strip()}: {type(e).__name__}: {e}", file=sys.stderr)
+            command_status = 1
+        if command_status:
+            status = command_status
+            if command_status == 2:
+                print(f"line {line_no}: {line.strip()}: usage error", file=sys.stderr)
+    return status
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "batch":
+        if len(argv) > 1:
+            with (open(argv[1])) as fp:
+                return run_batch(fp)
+        return run_batch(sys.stdin)
+    return run_command(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+Finds the CPUs the runner may use, to choose the number of mace4 to run at the same time
+and to pin each of them to its own core and NUMA memory node.
+
+The CPUs come from the affinity of this process (which reflects cpusets and taskset), limited
+by the CPU quota of its cgroup (v2 cpu.max or v1 cpu.cfs_quota_us).  The cgroup is found from
+/proc/self/cgroup, and the tightest quota along the path from it up to the root is used.  Only one hardware thread
+of each physical core is used, and the cores are taken from the NUMA nodes in turn.
+"""
+
+import os
+import math
+
+
+proc_cgroup = "/proc/self/cgroup"
+cgroup_root = "/sys/fs/cgroup"
+node_dir = "/sys/devices/system/node"
+cpu_dir = "/sys/devices/system/cpu"
+
+
+def read_first_line(fn):
+    try:
+        with (open(fn)) as fp:
+            return fp.readline().strip()
+    except OSError:
+        return None
+
+
+def parse_cpu_list(cpu_list):
+    """ parses a Linux cpu list, e.g. "0-3,8,10-11"
+    Args:
+        cpu_list (str): the cpu list
+    Returns:
+        (List[int]): the cpus in the list
+    """
+    cpus = list()
+    for part in cpu_list.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.extend(range(int(first), int(last)+1))
+        elif part:
+            cpus.append(int(part))
+    return cpus
+
+
+def available_cpus():
+    """ the cpus this process may run on """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def cgroup_paths():
+    """ the cgroup of this process in each hierarchy
+    Returns:
+        (dict): path of the cgroup for each v1 controller, e.g. {"cpu": "/user.slice"}, and for
+                the v2 hierarchy under the key ""
+    """
+    paths = dict()
+    try:
+        with (open(proc_cgroup)) as fp:
+            for line in fp:
+                parts = line.rstrip("\n").split(":", 2)
+                if len(parts) == 3:
+                    for controller in parts[1].split(","):
+                        paths[controller] = parts[2]
+    except OSError:
+        pass
+    return paths
+
+
+def ancestors(mount, path):
+    """ the directories of a cgroup and of all its parents, up to the mount point of the hierarchy """
+    directories = [mount]
+    parts = [part for part in path.split("/") if part]
+    for x in range(len(parts)):
+        directories.append(os.path.join(mount, *parts[:x+1]))
+    return reversed(directories)
+
+
+def quota_cpus(quota, period):
+    """ the number of cpus a quota allows, or None if there is no quota """
+    if quota is None or period is None or quota == "max" or int(quota) <= 0:
+        return None
+    return math.ceil(int(quota) / int(period))
+
+
+def cgroup_cpu_limit():
+    """ the number of cpus allowed by the cgroup quotas, or None if there is no quota """
+    paths = cgroup_paths()
+    limits = list()
+    for directory in ancestors(cgroup_root, paths.get("", "/")):
+        line = read_first_line(os.path.join(directory, "cpu.max"))
+        if line is not None:
+            limits.append(quota_cpus(*(line.split() + [None])[:2]))
+    for directory in ancestors(os.path.join(cgroup_root, "cpu"), paths.get("cpu", "/")):
+        limits.append(quota_cpus(read_first_line(os.path.join(directory, "cpu.cfs_quota_us")),
+                                 read_first_line(os.path.join(directory, "cpu.cfs_period_us"))))
+    limits = [limit for limit in limits if limit is not None]
+    return min(limits) if limits else None
+
+
+def numa_nodes():
+    """ the NUMA node of each cpu, empty if the machine does not say """
+    nodes = dict()
+    if not os.path.isdir(node_dir):
+        return nodes
+    for name in os.listdir(node_dir):
+        if name.startswith("node") and name[4:].isdigit():
+            cpu_list = read_first_line(os.path.join(node_dir, name, "cpulist"))
+            for cpu in parse_cpu_list(cpu_list or ""):
+                nodes[cpu] = int(name[4:])
+    return nodes
+
+
+def physical_cores(cpus):
+    """ keeps only the first hardware thread of each physical core
+    Args:
+        cpus (List[int]): cpus to choose from
+    Returns:
+        (List[int]): one cpu for each physical core
+    """
+    allowed = set(cpus)
+    cores = list()
+    seen = set()
+    for cpu in cpus:
+        siblings = read_first_line(os.path.join(cpu_dir, f"cpu{cpu}", "topology", "thread_siblings_list"))
+        core = tuple(sorted(allowed.intersection(parse_cpu_list(siblings)))) if siblings else (cpu,)
+        if core not in seen:
+            seen.add(core)
+            cores.append(cpu)
+    return cores
+
+
+def placements():
+    """ the (cpu, NUMA node) for the workers, one per physical core, limited by the cgroup quota,
+        with the cores taken from the NUMA nodes in turn.  The node is None when unknown.
+    Returns:
+        (List[tuple]): list of (cpu, node)
+    """
+    nodes = numa_nodes()
+    by_node = dict()
+    for cpu in physical_cores(available_cpus()):
+        by_node.setdefault(nodes.get(cpu, None), list()).append(cpu)
+    queues = [by_node[node] for node in sorted(by_node, key=lambda node: -1 if node is None else node)]
+    result = list()
+    while any(queues):
+        for queue in queues:
+            if queue:
+                cpu = queue.pop(0)
+                result.append((cpu, nodes.get(cpu, None)))
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        result = result[:max(limit, 1)]
+    return result
@@ -11,16 +11,14 @@ Last line: 3649
 
 import os
 import sys
-from ast import literal_eval as make_tuple
-from openpyxl import load_workbook
+from varieties import profiling
+from varieties import manifest
+from varieties.mace4 import sos_line, goal_line, end_line, write_input
 
 
 comment_lines = ['% The aim is to find a model in the epigroup but not in the subepigroup\n',
                  '% sos is the epigroup, and goals represent the subepigroup.\n']
 
-sos_line = "\nformulas(sos).\n"
-goal_line = "\nformulas(goals).\n"
-end_line = "end_of_list.\n"
 basic_str = """(x * y) * z = x * (y * z).
 x' = x' * (x * x').
 x * x' = x' * x.
@@ -34,16 +32,11 @@ def write_file(out_dir, n, variety_formula, subvariety_formula):
         out_dir (str): output directory
         n (int):  
     """
-    fn = os.path.join(out_dir, f"epigroup_{n}.in")
-    with (open(fn, "w")) as fp:
-        fp.writelines(comment_lines)
-        fp.write(sos_line)
-        fp.writelines(basic_str)
-        fp.write(f"\n{variety_formula}\n")
-        fp.write(end_line)
-        fp.write(goal_line)
-        fp.write(f"{subvariety_formula}\n")
-        fp.write(end_line)
+    with profiling.phase("build"):
+        fn = os.path.join(out_dir, f"epigroup_{n}.in")
+        lines = comment_lines + [sos_line, basic_str, f"\n{variety_formula}\n", end_line,
+                                 goal_line, f"{subvariety_formula}\n", end_line]
+    write_input(fn, lines)
 
 
 def gen_formula(n):
@@ -71,15 +64,23 @@ def gen_mace4_files(start, end, out_dir):
         subvariety = variety
     
 
-if __name__ == "__main__":
-    start = int(sys.argv[1])
-    end = int(sys.argv[2])
+def main(argv):
+    argv = profiling.start(argv)
+    argv = manifest.start(argv, "epigroup")
+    # e.g. varieties generate epigroup 3 8 inputs_epigroup
+    start = int(argv[0])
+    end = int(argv[1])
     if start < 2 or start > end:
         print("<start must not be greater than end and must be greater than 2>.")
     else:
-        if len(sys.argv) > 3:
-            out_dir = sys.argv[3]
+        if len(argv) > 2:
+            out_dir = argv[2]
         else:
             out_dir = "."
         gen_mace4_files(start, end, out_dir)
-    
+    manifest.finish()
+    profiling.stop()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
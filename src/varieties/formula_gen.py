@@ -7,7 +7,10 @@ Level 0 is bottom of Figure 1 on p.5.
 
 import os
 import sys
-from var_gen import gen_varieties
+from varieties.var_gen import gen_varieties
+from varieties import profiling
+from varieties import manifest
+from varieties.mace4 import sos_line, goal_line, end_line, write_input
 
 
 comment_lines = ['% This Mace4 inputs file is based on the paper https://arxiv.org/pdf/1911.05817.pdf.\n',
@@ -17,9 +20,6 @@ comment_lines = ['% This Mace4 inputs file is based on the paper https://arxiv.o
                  '% The top end of the branch (line) is a variety, and the bottom end of the branch is a subvariety.\n'
                  '% The formulas in this file is to find a model in the variety but not in the subvariety.\n',
                  '% sos is the variety, and goals represent the subvariety.\n']
-sos_line = "\nformulas(sos).\n"
-goal_line = "\nformulas(goals).\n"
-end_line = "end_of_list.\n"
 basic_str = ['(x * y) * z = x * (y * z).\n',  'x * x = x.\n']
 
 
@@ -112,20 +112,16 @@ def write_file(out_dir, branch, mace4_formulas, level, top, bottom):
         top (int):     index into top algebra clause
         bottom (int):  index into bottom algebra clause
     """
-    fn = os.path.join(out_dir, f"level{level}_{branch}.in")
-    with (open(fn, "w")) as fp:
-        fp.writelines(comment_lines)
-        fp.write(sos_line)
-        fp.writelines(basic_str)
-        fp.write(f"\n{mace4_formulas[level-3][top]}\n")
-        fp.write(end_line)
-        fp.write(goal_line)
-        fp.write(f"{mace4_formulas[level-1-3][bottom]}\n")
-        fp.write(end_line)
+    with profiling.phase("build"):
+        fn = os.path.join(out_dir, f"level{level}_{branch}.in")
+        lines = comment_lines + [sos_line] + basic_str + [f"\n{mace4_formulas[level-3][top]}\n", end_line,
+                                                        goal_line, f"{mace4_formulas[level-1-3][bottom]}\n", end_line]
+    write_input(fn, lines)
 
 
 def gen_mace4_files(n, out_dir):
-    mace4_formulas = gen_mace4_formulas(n)
+    with profiling.phase("build"):
+        mace4_formulas = gen_mace4_formulas(n)
     # debug_print(mace4_formulas)
     for level in range(4, n+1):
         write_file(out_dir, 1, mace4_formulas, level, 0, 0)
@@ -137,18 +133,25 @@ def gen_mace4_files(n, out_dir):
         write_file(out_dir, 4, mace4_formulas, level, -1, -1)
     
 
-if __name__ == "__main__":
+def main(argv):
+    argv = profiling.start(argv)
+    argv = manifest.start(argv, "bands")
     # level must be at least 4
-    if len(sys.argv) > 1:
-        n = int(sys.argv[1])
+    if len(argv) > 0:
+        n = int(argv[0])
     else:
         n = 4
     if n < 4:
         print("level must be at least 4.")
     else:
-        if len(sys.argv) > 2:
-            out_dir = sys.argv[2]
+        if len(argv) > 1:
+            out_dir = argv[1]
         else:
             out_dir = "."
         v = gen_mace4_files(n, out_dir)
-    
+    manifest.finish()
+    profiling.stop()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -7,15 +7,13 @@ The aim is to find a model that is a group by does not satisfy the special condi
 
 import os
 import sys
-from ast import literal_eval as make_tuple
-from openpyxl import load_workbook
+from varieties import profiling
+from varieties import manifest
+from varieties.mace4 import sos_line, goal_line, end_line, write_input
 
 
 comment_lines = ['% The aim is to find a model in a group by does not satisfy the special condition\n']
 
-sos_line = "\nformulas(sos).\n"
-goal_line = "\nformulas(goals).\n"
-end_line = "end_of_list.\n"
 group_strs = ["(x * y) * z = x * (y * z).\n", "1 * x = x.\n", "x * 1 = x.\n",
              "x' * x = 1.\n", "x * x' = 1.\n"]
 commute_clause = "a * b = b * a."
@@ -30,21 +28,16 @@ def write_file(out_dir, id_string, additional_cond, basic_comp, power):
         basic_comp (str): basic component
         power (int):  power to apply to id_sting
     """
-    clause = basic_comp
-    all_clauses = list()
-    for _ in range(2, power+1):
-        clause = f"({clause}) * {basic_comp}"
-        all_clauses.append(f"{clause} = 1.\n")
-    fn = os.path.join(out_dir, f"group_{id_string}_{power}.in")
-    with (open(fn, "w")) as fp:
-        fp.writelines(comment_lines)
-        fp.write(sos_line)
-        fp.writelines(group_strs)
-        fp.write(end_line)
-        fp.write(goal_line)
-        fp.write(f"{additional_cond}\n")
-        fp.writelines(all_clauses)
-        fp.write(end_line)
+    with profiling.phase("build"):
+        clause = basic_comp
+        all_clauses = list()
+        for _ in range(2, power+1):
+            clause = f"({clause}) * {basic_comp}"
+            all_clauses.append(f"{clause} = 1.\n")
+        fn = os.path.join(out_dir, f"group_{id_string}_{power}.in")
+        lines = (comment_lines + [sos_line] + group_strs + [end_line, goal_line, f"{additional_cond}\n"]
+                 + all_clauses + [end_line])
+    write_input(fn, lines)
 
 
 def gen_mace4_files(out_dir, level_from, level_to):
@@ -58,13 +51,21 @@ def gen_mace4_files(out_dir, level_from, level_to):
         write_file(out_dir, "ab", commute_clause, "(a*b)", n)
     
 
-if __name__ == "__main__":
-    # e.g. ./src/groups/gen_formulas.py 2 9 inputs_group
-    n1 = int(sys.argv[1])
-    n2 = int(sys.argv[2])
-    if len(sys.argv) > 3:
-        out_dir = sys.argv[3]
+def main(argv):
+    argv = profiling.start(argv)
+    argv = manifest.start(argv, "groups")
+    # e.g. varieties generate groups 2 9 inputs_group
+    n1 = int(argv[0])
+    n2 = int(argv[1])
+    if len(argv) > 2:
+        out_dir = argv[2]
     else:
         out_dir = "."
     v = gen_mace4_files(out_dir, n1, n2)
-    
+    manifest.finish()
+    profiling.stop()
+
+
+if __name__ == "__main__":
+    # e.g. ./src/varieties/groups/gen_formulas.py 2 9 inputs_group
+    main(sys.argv[1:])
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Run mace4 on all files (as inputs to Mace4) given in a directory, except for those
+that have successfully been run (i.e. models found) previously, as shown in the
+output files in a specific output directory. 
+The runner is shared by all the pipelines, see varieties/runner.py.
+"""
+import sys
+from varieties.runner import main
+
+
+if __name__ == "__main__":
+    # e.g. ./src/varieties/groups/run_groups.py inputs outputs
+    main(sys.argv[1:])
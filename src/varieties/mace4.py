@@ -0,0 +1,93 @@
+"""
+Pieces shared by all the pipelines: the boiler-plate lines of Mace4 inputs files,
+writing the inputs files, and parsing the Mace4 output files.
+"""
+
+import os
+from varieties import profiling
+from varieties import manifest
+
+
+sos_line = "\nformulas(sos).\n"
+goal_line = "\nformulas(goals).\n"
+end_line = "end_of_list.\n"
+associativity_str = "(x * y) * z = x * (y * z).\n"
+
+
+def write_input(fn, lines, key=None):
+    """ writes out a mace4 input file in one go, unless it already has this content (see manifest.py).
+    Args:
+        fn (str): full path name of the input file
+        lines (List[str]): lines of the input file
+        key: what the file is generated for, e.g. the spreadsheet row; the file name if None
+    """
+    with profiling.phase("emit"):
+        text = "".join(lines)
+    with profiling.phase("write"):
+        manifest.write(fn, text, key)
+
+
+def parse_output(file_path):
+    """ Parses a mace4 output file.  When a search is resumed from its last domain size,
+        the output of the new run is appended to the same file, so a file may hold several
+        runs one after the other.  CPU times are accumulated over all the runs.
+    Args:
+        file_path (str): full path name of the mace4 output file
+    Returns:
+        (tuple): (order, domain size, CPU time on the last domain size, total CPU time, comment,
+                  dict of CPU time spent on each domain size searched)
+    """
+    order = -1
+    error = ""
+    domain_size = None
+    last_cpu_time = 0
+    cpu_time = 0
+    run_offset = 0
+    size_times = dict()
+    with profiling.phase("read"):
+        with (open(file_path)) as fp:
+            lines = fp.readlines()
+    with profiling.phase("parse"):
+        for line in lines:
+            if line.startswith("============================== Mace4"):
+                run_offset = cpu_time
+            elif line.startswith("interpretation("):
+                pos = line.find(",")
+                order = int(line[16:pos])
+            elif line.startswith("Current CPU time: " ):
+                pos1 = line.find("(total CPU time: ")
+                pos2 = line.rfind(" seconds")
+                last_cpu_time = cpu_time
+                cpu_time = run_offset + float(line[pos1+16:pos2])
+                size_times[domain_size] = size_times.get(domain_size, 0) + cpu_time - last_cpu_time
+            elif line.startswith("For domain size "):
+                domain_size = int(line[16:-2])
+            elif line.startswith("Exiting with failure."):
+                error = f"Exiting with failure, last domain size: {domain_size}"
+            elif line.startswith("Process ") and "(max_megs_no)" in line:
+                error = f"exceeded memory limit, last domain size: {domain_size}"
+            elif line.startswith("Process ") and "(max_sec_no)" in line:
+                error = f"exceeded time limit, last domain size: {domain_size}"
+            elif line.startswith("Process ") and "(max_models)" in line:
+                error = f"found a model of order {order}"
+            elif line.startswith(f"Fatal error:  palloc"):
+                error = f"out of memory, last domain size: {domain_size}"
+            elif line.startswith("Killed"):
+                error = f"Killed, last domain size: {domain_size}"
+            elif line.startswith("Implication holds."):
+                error = "implication holds"
+    this_cpu_time = round(cpu_time - last_cpu_time, 2)
+    return (order, domain_size, this_cpu_time, cpu_time, error, size_times)
+
+
+def searched_range(size_times):
+    """ Formats the domain sizes searched, over all runs, e.g. ("2-7", "2:0.0 3:0.01 ...")
+    Args:
+        size_times (dict): CPU time spent on each domain size
+    Returns:
+        (tuple): the range of domain sizes searched and the CPU time spent on each of them
+    """
+    sizes = sorted(size for size in size_times if size is not None)
+    if not sizes:
+        return ("", "")
+    return (f"{sizes[0]}-{sizes[-1]}", " ".join(f"{size}:{round(size_times[size], 2)}" for size in sizes))
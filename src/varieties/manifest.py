@@ -0,0 +1,165 @@
+"""
+Content-addressed writing of the Mace4 inputs files.  Each output directory keeps a manifest
+(.manifest, JSON) of the SHA-256 of the content of each file generated there, with its size and
+mtime; a file whose size or mtime no longer matches is hashed again from disk.  A file is only
+written when it is new or its content has changed, so unchanged files keep their mtimes, and
+it is written to a temporary file first and renamed, so readers never see half a file.
+
+Each entry also records the generator that wrote the file and its key (e.g. the spreadsheet row
+for semi, the file name by default).  A file is stale when the same generator wrote it for a key
+generated again by this run, but did not write it this time, e.g. a file of a row whose varieties
+have changed in the spreadsheet.  Files of other generators or of keys outside the requested range
+are never stale.  The stale files are counted, listed with --verbose, and deleted with
+--delete-stale.
+"""
+
+import os
+
+
+manifest_name = ".manifest"
+delete_stale = False
+verbose = False
+generator = None        # name of the generator of this run, e.g. "semi"
+manifests = dict()      # output directory -> {file name: [SHA-256 of the content, size, mtime in ns, generator, key]}
+generated = dict()      # output directory -> file names generated by this run
+keys = dict()           # output directory -> keys generated by this run
+counts = {"new": 0, "changed": 0, "unchanged": 0, "removed": 0}
+changes = list()        # (status, full path name) of the files written or deleted by this run
+
+
+def start(argv, name):
+    """ takes --delete-stale and --verbose out of the command line arguments
+    Args:
+        argv (List[str]): command line arguments
+        name (str): name of the generator, e.g. "semi"
+    Returns:
+        (List[str]): the remaining arguments
+    """
+    global delete_stale, verbose, generator
+    reset()
+    delete_stale = "--delete-stale" in argv
+    verbose = "--verbose" in argv
+    generator = name
+    return [arg for arg in argv if arg not in ("--delete-stale", "--verbose")]
+
+
+def load(out_dir):
+    if out_dir not in manifests:
+        import json
+        try:
+            with (open(os.path.join(out_dir, manifest_name))) as fp:
+                manifests[out_dir] = json.load(fp)
+        except (OSError, ValueError):
+            manifests[out_dir] = dict()
+        generated[out_dir] = set()
+        keys[out_dir] = set()
+    return manifests[out_dir]
+
+
+def digest(text):
+    import hashlib
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def replace(fn, text):
+    """ writes the file atomically, via a temporary file in the same directory """
+    tmp = os.path.join(os.path.dirname(fn), f".{os.path.basename(fn)}.{os.getpid()}.tmp")
+    with (open(tmp, "w")) as fp:
+        fp.write(text)
+    os.replace(tmp, fn)
+
+
+def write(fn, text, key=None):
+    """ writes out a file unless it already has this content
+    Args:
+        fn (str): full path name of the file
+        text (str): content of the file
+        key: what the file is generated for, e.g. the spreadsheet row; the file name if None
+    """
+    out_dir, name = os.path.split(fn)
+    entries = load(out_dir or ".")
+    generated[out_dir or "."].add(name)
+    key = name if key is None else key
+    keys[out_dir or "."].add(key)
+    new_digest = digest(text)
+    try:
+        stat = os.stat(fn)
+    except FileNotFoundError:
+        stat = None
+    old_digest = None
+    if stat is not None:
+        entry = entries.get(name, None)
+        if entry is not None and entry[1:3] == [stat.st_size, stat.st_mtime_ns]:
+            old_digest = entry[0]
+        else:
+            with (open(fn)) as fp:
+                old_digest = digest(fp.read())
+    if old_digest == new_digest:
+        counts["unchanged"] += 1
+    else:
+        replace(fn, text)
+        stat = os.stat(fn)
+        status = "new" if old_digest is None else "changed"
+        counts[status] += 1
+        changes.append((status, fn))
+    entries[name] = [new_digest, stat.st_size, stat.st_mtime_ns, generator, key]
+
+
+def remove(fn):
+    """ deletes a file the generator no longer writes, e.g. the unsplit file of a row written
+        with --split-goals
+    Args:
+        fn (str): full path name of the file
+    """
+    out_dir, name = os.path.split(fn)
+    entries = load(out_dir or ".")
+    entries.pop(name, None)
+    try:
+        os.remove(fn)
+    except FileNotFoundError:
+        return
+    counts["removed"] += 1
+    changes.append(("removed", fn))
+
+
+def is_stale(out_dir, name, entry):
+    """ whether a file of the manifest was written by this generator for a key generated by this run,
+        but not generated by this run
+    """
+    return name not in generated[out_dir] and len(entry) == 5 and entry[3] == generator and entry[4] in keys[out_dir]
+
+
+def finish():
+    """ deals with the stale files, saves the manifests, and reports what changed """
+    import json
+    stale = 0
+    for out_dir, entries in manifests.items():
+        for name in sorted(name for name, entry in entries.items() if is_stale(out_dir, name, entry)):
+            stale += 1
+            if delete_stale:
+                try:
+                    os.remove(os.path.join(out_dir, name))
+                except FileNotFoundError:
+                    pass
+                del entries[name]
+                changes.append(("deleted", os.path.join(out_dir, name)))
+            else:
+                changes.append(("stale", os.path.join(out_dir, name)))
+        replace(os.path.join(out_dir, manifest_name), json.dumps(entries, sort_keys=True))
+    if manifests:
+        for status, fn in changes:
+            if status == "changed" or (verbose and status in ("removed", "stale", "deleted")):
+                print(f"{status}: {fn}")
+        print(f"{counts['new']} new, {counts['changed']} changed, {counts['unchanged']} unchanged, "
+              f"{counts['removed']} removed, {stale} stale{' (deleted)' if delete_stale else ''}")
+    reset()
+
+
+def reset():
+    """ forgets the files of the previous run, e.g. of a command that failed in varieties batch """
+    manifests.clear()
+    generated.clear()
+    keys.clear()
+    changes.clear()
+    for status in counts:
+        counts[status] = 0
@@ -12,6 +12,9 @@ Input level must be at least 2.
 
 import os
 import sys
+from varieties import profiling
+from varieties import manifest
+from varieties.mace4 import sos_line, goal_line, end_line, write_input
 
 
 comment_lines = ['% This Mace4 inputs file is based on the paper https://arxiv.org/pdf/1911.05817.pdf\n',
@@ -23,9 +26,6 @@ comment_lines = ['% This Mace4 inputs file is based on the paper https://arxiv.o
                  '% The top (or right) end of the branch (line) is a variety, and the bottom (or left) end of the branch is a subvariety,\n',
                  '% The aim is to find a model in the variety but not in the subvariety\n',
                  '% sos is the variety, and goals represent the subvariety.\n']
-sos_line = "\nformulas(sos).\n"
-goal_line = "\nformulas(goals).\n"
-end_line = "end_of_list.\n"
 basic_str = ['(x * y) * z = x * (y * z).\n',  '(x * x) * x = x * x.\n', 'x * y = y * x.\n']
 
 
@@ -100,16 +100,11 @@ def write_file(out_dir, level, mace_formulas):
         branch (str):  branch string, left or right (see Fig. 13 on page 40 of the paper)
         mace_formulas(List[str]): a list, first item is the string for sos, second item is goals
     """
-    fn = os.path.join(out_dir, f"level{level}.in")
-    with (open(fn, "w")) as fp:
-        fp.writelines(comment_lines)
-        fp.write(sos_line)
-        fp.writelines(basic_str)
-        fp.write(f"\n{mace_formulas[0]}\n")
-        fp.write(end_line)
-        fp.write(goal_line)
-        fp.write(f"{mace_formulas[1]}\n")
-        fp.write(end_line)
+    with profiling.phase("build"):
+        fn = os.path.join(out_dir, f"level{level}.in")
+        lines = comment_lines + [sos_line] + basic_str + [f"\n{mace_formulas[0]}\n", end_line,
+                                                        goal_line, f"{mace_formulas[1]}\n", end_line]
+    write_input(fn, lines)
 
 
 def gen_mace4_files(n1, n2, out_dir):
@@ -119,29 +114,39 @@ def gen_mace4_files(n1, n2, out_dir):
         Right sequence R1 (x1^2 = x1), R2 (x1^2x2 = x1x2), ...
     """
     for level in range(n1, n2+1):
-        right = gen_mace4_formulas_right(level)
+        with profiling.phase("build"):
+            right = gen_mace4_formulas_right(level)
         write_file(out_dir, f"R{level-1}_implies_R{level}", right[1])
         write_file(out_dir, f"L{level}_implies_R{level}", right[0])
 
     n1 = max(n1, 3)
     for level in range(n1, n2+1):
-        left = gen_mace4_formulas_left(level)
+        with profiling.phase("build"):
+            left = gen_mace4_formulas_left(level)
         write_file(out_dir, f"L{level-1}_implies_L{level}", left[1])
     
 
-if __name__ == "__main__":
-    if len(sys.argv) > 2:
-        n1 = int(sys.argv[1])
-        n2 = int(sys.argv[2])
+def main(argv):
+    argv = profiling.start(argv)
+    argv = manifest.start(argv, "nilpotent_monoid2")
+    # e.g. varieties generate nilpotent_monoid2 3 8 inputs_nilpotent
+    if len(argv) > 1:
+        n1 = int(argv[0])
+        n2 = int(argv[1])
     else:
         n1 = 3
         n2 = 4
     if n1 < 2 or n1 > n2:
         print("Levels must be at least 2, and starting level must not be greater than ending level.")
     else:
-        if len(sys.argv) > 3:
-            out_dir = sys.argv[3]
+        if len(argv) > 2:
+            out_dir = argv[2]
         else:
             out_dir = "."
         v = gen_mace4_files(n1, n2, out_dir)
-    
+    manifest.finish()
+    profiling.stop()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,155 @@
+"""
+Optional profiling of the generators and the collector, turned on by --profile.
+The wall time and the memory of each phase, e.g. load, build, emit, write, read, parse,
+aggregate, are printed to stderr when the command finishes.  The memory of a phase is how much
+it raised the peak resident set size of the process, added up over its calls, which costs
+nothing to measure; a phase that stays below the peak of an earlier phase shows 0.
+With --profile-memory, it is instead the largest rise, over the calls of the phase, of the memory
+allocated by Python above what was allocated when the call started, as traced by tracemalloc;
+tracing slows everything down several times, so the wall times are then not to be trusted.
+With --profile-out FILE, a cProfile dump is also written to FILE, which can be looked at with
+pstats or turned into a flame graph (e.g. with flameprof or snakeviz).
+
+When profiling is off, phase() returns a shared do-nothing context manager, and
+tracemalloc and cProfile are never started.
+"""
+
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+
+enabled = False
+trace_memory = False
+profile_out = None
+profiler = None
+phases = dict()     # phase name -> [wall time (s), peak memory (bytes), number of calls]
+start_time = 0
+_off = nullcontext()
+
+
+def phase(name):
+    """ context manager around one phase of the work; the times of all calls with the same name
+        are added up
+    Args:
+        name (str): name of the phase
+    """
+    if not enabled:
+        return _off
+    return _timed(name)
+
+
+def peak_rss():
+    """ the peak resident set size of the process so far in bytes, 0 if unknown """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def peak_memory():
+    if trace_memory:
+        import tracemalloc
+        return tracemalloc.get_traced_memory()[1]
+    return peak_rss()
+
+
+@contextmanager
+def _timed(name):
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+    else:
+        rss_before = peak_rss()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - start
+        stats = phases.setdefault(name, [0, 0, 0])
+        stats[0] += wall
+        if trace_memory:
+            stats[1] = max(stats[1], peak_memory() - traced_before)
+        else:
+            stats[1] += peak_rss() - rss_before
+        stats[2] += 1
+
+
+def start(argv):
+    """ takes the profiling options out of the command line arguments and starts profiling if asked
+    Args:
+        argv (List[str]): command line arguments
+    Returns:
+        (List[str]): the arguments without --profile, --profile-memory and --profile-out FILE
+    """
+    global enabled, trace_memory, profile_out, profiler, start_time
+    if enabled:
+        # left on by a command that failed, e.g. in varieties batch
+        if profiler is not None:
+            profiler.disable()
+        if trace_memory:
+            import tracemalloc
+            tracemalloc.stop()
+        enabled, trace_memory, profile_out, profiler = False, False, None, None
+    rest = list()
+    args = iter(argv)
+    for arg in args:
+        if arg == "--profile":
+            enabled = True
+        elif arg == "--profile-memory":
+            enabled = True
+            trace_memory = True
+        elif arg == "--profile-out":
+            enabled = True
+            profile_out = next(args)
+        elif arg.startswith("--profile-out="):
+            enabled = True
+            profile_out = arg[len("--profile-out="):]
+        else:
+            rest.append(arg)
+    if enabled:
+        phases.clear()
+        if trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if profile_out is not None:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        start_time = time.perf_counter()
+    return rest
+
+
+def stop():
+    """ stops profiling, prints the time and memory of each phase and the peak memory of the run,
+        and dumps the cProfile data
+    """
+    global enabled, trace_memory, profile_out, profiler
+    if not enabled:
+        return
+    total = time.perf_counter() - start_time
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(profile_out)
+    peak = max([peak_memory()] + [stats[1] for stats in phases.values()]) if trace_memory else peak_rss()
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.stop()
+    print(f"{'phase':<12}{'calls':>8}{'wall (s)':>12}{'traced +(MB)' if trace_memory else 'peak RSS +(MB)':>16}", file=sys.stderr)
+    for name, (wall, phase_peak, calls) in phases.items():
+        print(f"{name:<12}{calls:>8}{wall:>12.3f}{phase_peak / 2**20:>16.2f}", file=sys.stderr)
+    if trace_memory:
+        print(f"{'total':<12}{'':>8}{total:>12.3f}{peak / 2**20:>16.2f}", file=sys.stderr)
+    else:
+        print(f"{'total':<12}{'':>8}{total:>12.3f}", file=sys.stderr)
+        print(f"peak RSS of the process: {peak / 2**20:.2f} MB (--profile-memory for the memory allocated "
+              f"in each phase)", file=sys.stderr)
+    if profiler is not None:
+        print(f"cProfile data written to {profile_out}", file=sys.stderr)
+    enabled = False
+    trace_memory = False
+    profile_out = None
+    profiler = None
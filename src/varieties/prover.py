@@ -0,0 +1,212 @@
+"""
+A light-weight equational prover run on each Mace4 inputs file before mace4, to catch the
+problems where the sos identities imply the goal.  Mace4 can never find a model for those,
+and would search every domain size until it runs out of time.
+
+Only semigroup problems are handled: the sos must contain associativity, and all the other
+identities must be built from * alone.  Terms are then words, and associativity is built in.
+The goal is proved by a breadth first search from both of its sides, rewriting subwords with
+instances of the sos identities, with bounds on the length of the words and on the number
+of words visited.  When the two searches meet, the chain of rewrites is the proof.
+
+Variables are the symbols starting with u to z, as in Mace4.  The variables of the goal are
+taken as new constants.
+"""
+
+import re
+import time
+
+
+max_extra_length = 2    # words may grow this much longer than the longer side of the goal
+max_words = 20000       # words visited from each side of a goal
+max_seconds = 2         # for all the goals of a problem
+
+token_re = re.compile(r"\s*([A-Za-z0-9_]+|[*()=&.'|!-])")
+associativity_words = (("x", "y", "z"), ("x", "y", "z"))
+
+
+class Unsupported(Exception):
+    pass
+
+
+def is_variable(symbol):
+    return "u" <= symbol[0] <= "z"
+
+
+def parse_word(text):
+    """ parses a term built from * into a word, e.g. "(x * y) * x" into ("x", "y", "x")
+    Args:
+        text (str): the term
+    Returns:
+        (tuple): the word
+    """
+    tokens = token_re.findall(text)
+    if "".join(tokens) != re.sub(r"\s", "", text):
+        raise Unsupported(text)
+    word = list()
+    expect_symbol = True
+    for token in tokens:
+        if token == "*" and not expect_symbol:
+            expect_symbol = True
+        elif token in "()":
+            continue
+        elif expect_symbol and re.match(r"[A-Za-z0-9_]+$", token):
+            word.append(token)
+            expect_symbol = False
+        else:
+            raise Unsupported(text)
+    if expect_symbol:
+        raise Unsupported(text)
+    return tuple(word)
+
+
+def parse_equation(text):
+    """ parses an identity, e.g. "x * y = y * x" into (("x", "y"), ("y", "x")) """
+    sides = text.split("=")
+    if len(sides) != 2:
+        raise Unsupported(text)
+    return (parse_word(sides[0]), parse_word(sides[1]))
+
+
+def read_section(text, name):
+    start = text.find(f"formulas({name}).")
+    if start < 0:
+        return []
+    end = text.find("end_of_list.", start)
+    body = text[start + len(f"formulas({name}).") : end]
+    return [clause.strip() for clause in body.split(".") if clause.strip()]
+
+
+def read_problem(in_file):
+    """ reads the sos identities and the goals of a Mace4 inputs file
+    Args:
+        in_file (str): full path name of the inputs file
+    Returns:
+        (tuple): (list of sos identities, list of goals) as pairs of words, or None if the
+                 problem is not a semigroup problem the prover can handle
+    """
+    with (open(in_file)) as fp:
+        text = "".join(line.split("%")[0] + "\n" for line in fp)
+    try:
+        sos = [parse_equation(clause) for clause in read_section(text, "sos")]
+        goals = [parse_equation(conjunct) for clause in read_section(text, "goals") for conjunct in clause.split("&")]
+    except Unsupported:
+        return None
+    if associativity_words not in sos or not goals:
+        return None
+    return ([equation for equation in sos if equation != associativity_words], goals)
+
+
+def show(word):
+    return " * ".join(word)
+
+
+def rules_of(sos):
+    """ the rewrite rules, in both directions, that do not bring in new variables """
+    rules = list()
+    for left, right in sos:
+        for l, r in ((left, right), (right, left)):
+            if set(filter(is_variable, r)) <= set(filter(is_variable, l)):
+                rules.append((l, r, f"{show(left)} = {show(right)}"))
+    return rules
+
+
+def match(pattern, word, start, subst):
+    """ yields (end, substitution) for each way the pattern matches word[start:end] """
+    if not pattern:
+        yield start, subst
+        return
+    head, rest = pattern[0], pattern[1:]
+    if not is_variable(head):
+        if start < len(word) and word[start] == head:
+            yield from match(rest, word, start + 1, subst)
+    elif head in subst:
+        value = subst[head]
+        if word[start:start + len(value)] == value:
+            yield from match(rest, word, start + len(value), subst)
+    else:
+        for end in range(start + 1, len(word) - len(rest) + 1):
+            yield from match(rest, word, end, dict(subst, **{head: word[start:end]}))
+
+
+def rewrites(word, rules, max_length):
+    """ yields (new word, identity used) for each single rewrite of the word """
+    for l, r, name in rules:
+        for start in range(len(word)):
+            for end, subst in match(l, word, start, {}):
+                new_word = word[:start] + tuple(s for symbol in r for s in subst.get(symbol, (symbol,))) + word[end:]
+                if len(new_word) <= max_length:
+                    yield new_word, name
+
+
+def prove_goal(goal, rules, deadline):
+    """ searches for a chain of rewrites from one side of the goal to the other
+    Args:
+        goal (tuple): the two sides of the goal, as words
+        rules (list): rewrite rules from rules_of
+        deadline (float): time.perf_counter() value to give up at
+    Returns:
+        (List[str]): the proof, one line per step, or None if no proof is found
+    """
+    left, right = goal
+    max_length = max(len(left), len(right)) + max_extra_length
+    parents = [{left: None}, {right: None}]
+    frontiers = [[left], [right]]
+    meet = left if left == right else None
+    while meet is None and (frontiers[0] or frontiers[1]):
+        side = 0 if frontiers[0] and (not frontiers[1] or len(frontiers[0]) <= len(frontiers[1])) else 1
+        next_frontier = list()
+        for word in frontiers[side]:
+            for new_word, name in rewrites(word, rules, max_length):
+                if new_word in parents[side]:
+                    continue
+                parents[side][new_word] = (word, name)
+                if new_word in parents[1 - side]:
+                    meet = new_word
+                    break
+                next_frontier.append(new_word)
+            if meet is not None or len(parents[side]) > max_words or time.perf_counter() > deadline:
+                break
+        if meet is None and (len(parents[side]) > max_words or time.perf_counter() > deadline):
+            return None
+        frontiers[side] = next_frontier
+    if meet is None:
+        return None
+    steps = list()
+    word = meet
+    while parents[0][word] is not None:
+        word, name = parents[0][word]
+        steps.append((word, name))
+    proof = [show(steps[-1][0]) if steps else show(meet)]
+    for index in range(len(steps) - 1, -1, -1):
+        next_word = steps[index - 1][0] if index > 0 else meet
+        proof.append(f"  = {show(next_word)}    by {steps[index][1]}")
+    word = meet
+    while parents[1][word] is not None:
+        next_word, name = parents[1][word]
+        proof.append(f"  = {show(next_word)}    by {name}")
+        word = next_word
+    return proof
+
+
+def prove(in_file):
+    """ tries to prove all the goals of a Mace4 inputs file from its sos
+    Args:
+        in_file (str): full path name of the inputs file
+    Returns:
+        (List[str]): the proof of each goal, or None if some goal could not be proved
+    """
+    problem = read_problem(in_file)
+    if problem is None:
+        return None
+    sos, goals = problem
+    rules = rules_of(sos)
+    deadline = time.perf_counter() + max_seconds
+    proof = list()
+    for goal in goals:
+        steps = prove_goal(goal, rules, deadline)
+        if steps is None:
+            return None
+        proof.append(f"Goal: {show(goal[0])} = {show(goal[1])}")
+        proof.extend(steps)
+    return proof
@@ -0,0 +1,279 @@
+"""
+Run mace4 on all files (as inputs to Mace4) given in a directory, except for those
+that have successfully been run (i.e. models found) previously, as shown in the
+output files in a specific output directory.
+Searches that ran out of time or memory are resumed from the last domain size they
+were working on, with the output of the new run appended to the same output file.
+By default one mace4 is run on each physical core available (see cpus.py), each pinned
+to its own core with taskset or numactl, whichever is installed, and on NUMA machines with
+numactl installed, also to the memory of its NUMA node.  The placement is written at the top
+of the output of each run.  With more threads than cores, the extra slots are not pinned.
+Before mace4 is run on a problem, the equational prover (see prover.py) tries to show that
+the sos implies the goals; if it does, the proof is written to the output file instead.
+Files named <name>.g<k>.in are the goals of one problem split by the generator.  They are
+raced against each other: as soon as one of them has a model, the others are stopped.
+"""
+import sys
+import os
+import time
+import subprocess
+import threading
+import shutil
+import re
+from varieties import cpus
+from varieties import prover
+from varieties.mace4 import parse_output
+
+
+max_time = 3600     # to run mace4, in seconds
+max_threads = None  # set by setup_slots, one per physical core by default
+thread_slots = list()
+slot_placement = list()  # (cpu, NUMA node) of each pinned slot, one per core at most
+pin_tool = None         # "taskset" or "numactl", whichever is installed, None if mace4 is not pinned
+bind_memory = False     # whether numactl also binds each mace4 to the memory of its NUMA node
+use_prover = True
+running = dict()        # outfile -> (goal group, mace4 process) of the running mace4
+solved_groups = set()   # goal groups with a model
+results = dict()
+stopped_line = "% Stopped, another goal of the problem has a model.\n"
+
+
+def setup_slots(num_threads=None, pin=True):
+    """ sets up the thread slots, and the cpu and memory node each slot is pinned to
+    Args:
+        num_threads (int): number of mace4 to run at the same time, None for one per physical core
+        pin (bool): whether to pin each mace4 to a core
+    """
+    global max_threads, thread_slots, slot_placement, pin_tool, bind_memory
+    placements = cpus.placements()
+    if num_threads is None:
+        num_threads = len(placements)
+    max_threads = num_threads
+    thread_slots = [None] * num_threads
+    multi_node = len(set(cpus.numa_nodes().values())) > 1
+    if not pin:
+        pin_tool = None
+    elif shutil.which("numactl") and (multi_node or not shutil.which("taskset")):
+        pin_tool = "numactl"
+    elif shutil.which("taskset"):
+        pin_tool = "taskset"
+    else:
+        pin_tool = None
+    bind_memory = pin_tool == "numactl" and multi_node
+    slot_placement = placements[:num_threads] if pin_tool else list()
+    if pin_tool and num_threads > len(placements):
+        print(f"{num_threads} threads for {len(placements)} cores, the mace4 of the last "
+              f"{num_threads - len(placements)} slots are not pinned.", file=sys.stderr)
+
+
+def configure(argv):
+    """ takes --threads N, --no-pin and --no-prover out of the command line arguments, sets up the slots
+        and clears what is left from a previous run in the same process (e.g. in varieties batch)
+    Args:
+        argv (List[str]): command line arguments
+    Returns:
+        (List[str]): the remaining arguments
+    """
+    global use_prover
+    use_prover = True
+    running.clear()
+    solved_groups.clear()
+    results.clear()
+    num_threads = None
+    pin = True
+    rest = list()
+    args = iter(argv)
+    for arg in args:
+        if arg == "--threads":
+            num_threads = int(next(args))
+        elif arg.startswith("--threads="):
+            num_threads = int(arg[len("--threads="):])
+        elif arg == "--no-pin":
+            pin = False
+        elif arg == "--no-prover":
+            use_prover = False
+        else:
+            rest.append(arg)
+    setup_slots(num_threads, pin)
+    return rest
+
+
+def thread_available(thread_count, thread_slots):
+    for x in range(thread_count):
+        if thread_slots[x] is None:
+            return x
+    return None
+
+
+def all_done(thread_slots):
+    for x in range(len(thread_slots)):
+        if thread_slots[x] is not None:
+            return False
+    return True
+
+
+def wait_for_slot(num_threads, thread_slots, sleep_time):
+    busy = True
+    while busy:
+        x = thread_available(num_threads, thread_slots)
+        if x is None:
+            time.sleep(sleep_time)
+        else:
+            return x
+
+
+def goal_group(in_file):
+    """ the problem a split goal file belongs to, e.g. "0229_2_1_implies_3_1" for
+        "0229_2_1_implies_3_1.g2.in", or None if the file is not a split goal
+    """
+    m = re.match(r"(.*)\.g\d+\.in$", in_file)
+    return m.group(1) if m else None
+
+
+def has_model(outfile):
+    return os.path.exists(outfile) and parse_output(outfile)[0] != -1
+
+
+def stop_group(group):
+    """ stops the running mace4 of the other goals of a group that has a model """
+    solved_groups.add(group)
+    for other_group, proc in list(running.values()):
+        if other_group == group:
+            proc.terminate()
+
+
+def run_mace4(slot, key, mace_infile, outfile, start_size=None):
+    options = "" if start_size is None else f"-n {start_size} "
+    pin = ""
+    try:
+        with (open(outfile, "w" if start_size is None else "a")) as fp:
+            if slot < len(slot_placement):
+                cpu, node = slot_placement[slot]
+                if pin_tool == "taskset":
+                    pin = f"taskset -c {cpu} "
+                elif bind_memory and node is not None:
+                    pin = f"numactl --physcpubind={cpu} --membind={node} "
+                else:
+                    pin = f"numactl --physcpubind={cpu} "
+                fp.write(f"% Placement: cpu {cpu}, memory node {node}\n")
+        group = goal_group(os.path.basename(mace_infile))
+        proc = subprocess.Popen(f'exec {pin}mace4 {options}-t {max_time} -b 20000 -f {mace_infile} >> {outfile} 2>&1', shell=True)
+        running[outfile] = (group, proc)
+        proc.wait()
+        running.pop(outfile, None)
+        if group is not None:
+            if has_model(outfile):
+                stop_group(group)
+            elif group in solved_groups:
+                with (open(outfile, "a")) as fp:
+                    fp.write(stopped_line)
+    finally:
+        running.pop(outfile, None)
+        thread_slots[slot] = None
+
+
+def already_complete(outfile):
+    cp = subprocess.run(f'tail {outfile} | grep -e "Exiting with 1 model." -e "Implication holds." | wc -l', capture_output=True, shell=True)
+    if cp.stdout.decode("utf-8") == "1\n":
+        return True
+    else:
+        return False
+
+
+def write_proof(outfile, proof):
+    """ writes the proof found by the equational prover in place of the mace4 output
+    Args:
+        outfile (str): output file
+        proof (List[str]): the proof, from prover.prove
+    """
+    with (open(outfile, "w")) as fp:
+        fp.write("% The equational prover showed that the sos implies the goals, mace4 was not run.\n")
+        fp.write("% Proof (the variables of the goals are taken as constants):\n")
+        fp.writelines(f"% {line}\n" for line in proof)
+        fp.write("Implication holds.\n")
+
+
+def resume_domain_size(outfile):
+    """ Finds the domain size to resume a search from. All domain sizes below the last one
+        in the output of previous runs have been fully searched without finding a model.
+    Args:
+        outfile (str): output file of previous runs
+    Returns:
+        (int): the last domain size searched, or None if the search has to start from scratch
+    """
+    if not os.path.exists(outfile):
+        return None
+    return parse_output(outfile)[1]
+
+
+def write_stopped(outfile):
+    """ writes the output of a goal skipped because another goal of its problem has a model, so that
+        the collector sees that this goal was not searched. The output of earlier runs is kept.
+    Args:
+        outfile (str): output file
+    """
+    if not os.path.exists(outfile):
+        with (open(outfile, "w")) as fp:
+            fp.write(stopped_line)
+
+
+def run_process(num_threads, output_dir, inputs_dir, input_files, min_size=None):
+    """ starts mace4 on the inputs files that have no result yet, each as soon as a slot is free
+    Args:
+        num_threads (int): number of mace4 to run at the same time
+        output_dir (str): output directory
+        inputs_dir (str): directory of the mace4 inputs files
+        input_files (List[str]): names of the inputs files
+        min_size (int): domain size to start from when it is known that there is no smaller model
+    Returns:
+        (List[threading.Thread]): the threads started
+    """
+    threads = list()
+    for in_file in input_files:
+        group = goal_group(in_file)
+        if group is not None and has_model(f"{output_dir}/{in_file}.out"):
+            solved_groups.add(group)
+    for in_file in input_files:
+        components = in_file.split("_")
+        outfile = f"{output_dir}/{in_file}.out"
+        group = goal_group(in_file)
+        if already_complete(outfile):
+            continue
+        if group in solved_groups:
+            write_stopped(outfile)
+            continue
+        if use_prover:
+            proof = prover.prove(os.path.join(inputs_dir, in_file))
+            if proof is not None:
+                write_proof(outfile, proof)
+                continue
+        start_size = resume_domain_size(outfile)
+        if min_size is not None and (start_size is None or start_size < min_size):
+            start_size = min_size
+        slot_id = wait_for_slot(num_threads, thread_slots, 1);
+        if group in solved_groups:
+            write_stopped(outfile)
+            continue
+        thread_slots[slot_id] = threading.Thread(target=run_mace4, args=(slot_id, components[0], os.path.join(inputs_dir, in_file), outfile, start_size))
+        thread_slots[slot_id].start()
+        threads.append(thread_slots[slot_id])
+    return threads
+
+
+def run_all(inputs_dir, outputs_dir):
+    os.makedirs(outputs_dir, exist_ok=True)
+    solved_groups.clear()
+    input_files = [in_file for in_file in sorted(os.listdir(inputs_dir)) if in_file.endswith(".in")]
+    run_process(max_threads, outputs_dir, inputs_dir, input_files)
+    while not all_done(thread_slots):
+        time.sleep(1)
+
+
+def main(argv):
+    # e.g. varieties run groups inputs outputs --threads 8
+    argv = configure(argv)
+    run_all(argv[0], argv[1])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+This script is based on special pairs of varieties and subvarieties, as given by semi.xlsx.
+It looks at the output files to collect data such as the minimum order that
+has a model in a variety but not in a subvariety.
+
+First non (1,1) line: 229
+Last line: 3648
+"""
+
+import os
+import sys
+from varieties import profiling
+from varieties.mace4 import parse_output, searched_range
+
+
+def extract_data(file_path):
+    file_base_name = os.path.basename(file_path)
+    names = file_base_name.split("_")
+    line_no = int(names[0])
+    subvariety = (int(names[1]), int(names[2]))
+    variety = (int(names[4]), int(names[5].split(".")[0]))
+    order, domain_size, this_cpu_time, cpu_time, error, size_times = parse_output(file_path)
+    searched, history = searched_range(size_times)
+    if error.startswith("found a model of order"):
+        return (line_no, subvariety, variety, order, this_cpu_time, cpu_time, error, searched, history)
+    else:
+        return (line_no, subvariety, variety, domain_size, "", cpu_time, error, searched, history)
+
+
+def extract_all_data(out_dir):
+    all_results = list()
+    for file in os.listdir(out_dir):
+        results = extract_data(os.path.join(out_dir, file))
+        all_results.append(results)
+    with profiling.phase("aggregate"):
+        all_results.sort(key=lambda x:x[0])
+        for item in all_results:
+            print(item)
+    return all_results
+        
+        
+def merge_goals(results):
+    """ combines the results of the goals of a row split by gen_formulas.py --split-goals into one
+        result for the row: the smallest model found for any of the goals, or else the goal with the
+        smallest domain size searched.  The runner stops the other goals as soon as one has a model,
+        so when one of them had not searched all the orders below the model, the model only bounds
+        the minimum order, and the row is reported with the bounds and no order.
+    Args:
+        results (List[tuple]): results from the output files, as from extract_all_data
+    Returns:
+        (List[tuple]): one result for each row
+    """
+    rows = dict()
+    for item in results:
+        rows.setdefault(item[0], list()).append(item)
+    merged = list()
+    for line_no in sorted(rows):
+        items = rows[line_no]
+        if len(items) == 1:
+            merged.append(items[0])
+            continue
+        total = round(sum(item[5] for item in items), 2)
+        found = [item for item in items if item[6].startswith("found a model of order")]
+        open_goals = [item for item in items if item[6] != "implication holds"]
+        if found:
+            best = min(found, key=lambda item: item[3])
+            lower = min([best[3]] + [item[3] or 2 for item in open_goals if item not in found])
+            if lower < best[3]:
+                # the other goals were stopped before they searched all the orders below the model
+                orders = f"order {lower}" if lower == best[3] - 1 else f"orders {lower} to {best[3] - 1}"
+                merged.append(best[:3] + (None, "", total, f"model of order {best[3]}; {orders} not excluded "
+                                          f"({len(found)} of {len(items)} goals)") + best[7:])
+                continue
+            comment = f"{best[6]} ({len(found)} of {len(items)} goals)"
+        elif open_goals:
+            best = min(open_goals, key=lambda item: item[3] or 0)
+            comment = f"{best[6]} ({len(open_goals)} of {len(items)} goals open)"
+        else:
+            best = items[0]
+            comment = "implication holds"
+        merged.append(best[:5] + (total, comment) + best[7:])
+    return merged
+
+
+def apply_lattice(rows, results, excel_file):
+    """ adds the results that follow from the lattice of varieties to those from the output files
+    Args:
+        rows (List[tuple]): results for each row, as from merge_goals
+        results (List[tuple]): results from the output files, as from extract_all_data
+        excel_file (str): full path name of the excel file containing the varieties and subvarieties
+    Returns:
+        (List[tuple]): results for all the rows that have an output file or are settled by the lattice
+    """
+    from math import inf
+    from varieties.semi import lattice
+    from varieties.semi.gen_formulas import read_data
+    with profiling.phase("load"):
+        bases, implies = read_data(excel_file)
+    with profiling.phase("aggregate"):
+        res = {item[0]: item for item in rows}
+        known = dict()
+        for item in results:
+            order = item[3] if item[6].startswith("found a model of order") else -1
+            goal_bounds = lattice.output_bounds(order, item[3], item[6] == "implication holds")
+            pair = (item[1], item[2])
+            known[pair] = lattice.conjunction(known[pair], goal_bounds) if pair in known else goal_bounds
+        bounds = lattice.propagate(lattice.build_graph(implies), known)
+        for line_no, (subvariety, variety) in enumerate(implies, start=1):
+            pair_bounds = bounds[(subvariety, variety)]
+            if pair_bounds == known.get((subvariety, variety), (2, inf)):
+                continue
+            item = res.get(line_no, (line_no, subvariety, variety, None, "", "", "", "", ""))
+            comment = lattice.describe(pair_bounds)
+            if item[6]:
+                comment = f"{item[6]}; {comment}"
+            if lattice.decided(pair_bounds):
+                order = None if pair_bounds[1] == inf else pair_bounds[1]
+                res[line_no] = item[:3] + (order, item[4], item[5], comment) + item[7:]
+            else:
+                # the bounds are in the comment, the order column is only for a known min order
+                res[line_no] = item[:3] + (None, "", item[5], comment) + item[7:]
+    return sorted(res.values(), key=lambda x:x[0])
+
+
+def compose_csv_file(results, start, end, csv_file_path):
+    """
+    (3641, (8, 2), (5, 54), 3, 0.0, 0.0, 'max_models', '2-3', '2:0.0 3:0.0')
+    """
+    with profiling.phase("aggregate"):
+        res = {item[0]: item[1:] for item in results}
+    with profiling.phase("write"), (open(csv_file_path, "w")) as fp:
+        fp.write('"Subvariety"," => ","Variety","Last order","Time spent on last order (s)","Total time from order 2 (s)","Comment","Domain sizes searched","Time per domain size (s)"\n')
+        for idx in range(start, end+1):
+            r = res.get(idx, None)
+            if r is None:
+                fp.write('," => ",,,,,,,\n')
+            else:
+                fp.write(f'"{r[0]}"," => ","{r[1]}",{"" if r[2] is None else r[2]},{r[3]},{r[4]},"{r[5]}","{r[6]}","{r[7]}"\n')
+
+
+def main(argv):
+    argv = profiling.start(argv)
+    if len(argv) > 0:
+        out_dir = argv[0]
+    else:
+        out_dir = "."
+    csv_file_path = "sem.csv"
+    if len(argv) > 1:
+        csv_file_path = argv[1]
+    v = extract_all_data(out_dir)
+    with profiling.phase("aggregate"):
+        rows = merge_goals(v)
+    if len(argv) > 2:
+        rows = apply_lattice(rows, v, argv[2])
+    compose_csv_file(rows, 1, 3648, csv_file_path)
+    profiling.stop()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+This script is based on special pairs of varieties and subvarieties, as given by semi.xlsx. 
+It generates all formulas from the given spreadsheet 
+The aim is to find a model in the variety but not in the subvariety.
+
+Excel line starts with 1
+First non (1,1) line: 229
+Last line: 3649
+
+With --split-goals, a row whose subvariety has several identities is written as one
+file per identity, <row file>.g<k>.in, each with the same sos and one of the identities
+as the goal, so that the runner can race them.  Writing a row removes the files of the
+row in the other form, so switching --split-goals on or off never leaves both.
+"""
+
+import os
+import sys
+from functools import lru_cache
+from varieties import profiling
+from varieties import manifest
+from varieties.mace4 import sos_line, goal_line, end_line, associativity_str, write_input
+
+
+comment_lines = ['% The aim is to find a model in the variety but not in the subvariety\n',
+                 '% sos is the variety, and goals represent the subvariety.\n']
+
+basic_str = associativity_str
+    
+
+@lru_cache(maxsize=None)
+def read_data(excel_file):
+    """ reads the bases and the implications from the spreadsheet. openpyxl is only imported
+        here as it is slow to load, and the result is cached for batch runs.
+    """
+    from ast import literal_eval as make_tuple
+    from openpyxl import load_workbook
+    wb = load_workbook(excel_file)
+    sheet_bases = wb["bases"]
+    sheet_imply = wb["imply"]
+    bases = {make_tuple(row_cells[0].value): row_cells[1].value for row_cells in sheet_bases.iter_rows()}
+    implies = [[make_tuple(row_cells[0].value), make_tuple(row_cells[2].value)] for row_cells in sheet_imply.iter_rows()]
+    return (bases, implies)
+
+
+def split_files(fn):
+    """ the split goal files of a row already in the directory, e.g. 0229_2_1_implies_3_1.g1.in, ...
+    Args:
+        fn (str): full path name of the unsplit file of the row
+    """
+    files = list()
+    while os.path.exists(f"{fn[:-3]}.g{len(files)+1}.in"):
+        files.append(f"{fn[:-3]}.g{len(files)+1}.in")
+    return files
+
+
+def write_file(out_dir, line_no, variety, subvariety, variety_formula, subvariety_formula, split_goals=False):
+    """ writes out a mace4 input file. "bottom" level implies "top" level, so the "goal"
+        is the "bottom" level clause so to find a model in the "bigger" algebra but not in
+        the smaller algebra.
+    Args:
+        out_dir (str): output directory
+        line_no (int): line number in the excel file
+        variety (str):  tuple representing the variety
+        subvariety (str):  tuple representing the subvariety
+        variety_formula (str): Mace4 formula for the variety
+        subvariety_formula (str): Mace4 formula for the subvariety
+        split_goals (bool): whether to write one file for each identity of the subvariety
+    """
+    with profiling.phase("build"):
+        fn = os.path.join(out_dir, f"{format(line_no, '04d')}_{subvariety[0]}_{subvariety[1]}_implies_{variety[0]}_{variety[1]}.in")
+        goals = f"{subvariety_formula}"
+        conjuncts = [f"{goal.rstrip('.')}." for goal in goals.split(". ")]
+        if split_goals and len(conjuncts) > 1:
+            files = [(f"{fn[:-3]}.g{k}.in", goal) for k, goal in enumerate(conjuncts, start=1)]
+        else:
+            files = [(fn, goals.replace('. ', ' & '))]
+        obsolete = [other for other in [fn] + split_files(fn) if other not in dict(files)]
+    for other in obsolete:
+        manifest.remove(other)
+    for fn, goal in files:
+        with profiling.phase("build"):
+            lines = comment_lines + [sos_line, basic_str, f"\n{variety_formula}\n", end_line,
+                                     goal_line, f"{goal}\n", end_line]
+        write_input(fn, lines, line_no)
+
+
+def gen_mace4_files(excel_file, varieties, out_dir, split_goals=False):
+    """
+    Args:
+        excel_file (str): full path name of the excel file containing the varieties and subvarieties
+        varieties(List[int]): list of rows (as in the spreadsheet) to write out
+        out_dir (str): output directory
+        split_goals (bool): whether to write one file for each identity of the subvariety
+    """
+    with profiling.phase("load"):
+        bases, implies = read_data(excel_file)
+    for line_no in varieties:
+        subvariety, variety = implies[line_no-1]  # Excel startw with 1, python startw with zero
+        write_file(out_dir, line_no, variety, subvariety, bases[variety], bases[subvariety], split_goals)
+    
+
+def main(argv):
+    argv = profiling.start(argv)
+    argv = manifest.start(argv, "semi")
+    # e.g. varieties generate semi docs/semi.xlsx 229 300 inputs --split-goals
+    split_goals = "--split-goals" in argv
+    argv = [arg for arg in argv if arg != "--split-goals"]
+    excel_file = argv[0]
+    n1 = int(argv[1])
+    n2 = int(argv[2])
+    if n1 < 1 or n1 > n2:
+        print("<from excel row> must not be greater than <to excel row>.")
+    else:
+        if len(argv) > 3:
+            out_dir = argv[3]
+        else:
+            out_dir = "."
+        v = gen_mace4_files(excel_file, range(n1, n2+1), out_dir, split_goals)
+    manifest.finish()
+    profiling.stop()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
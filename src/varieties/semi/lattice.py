@@ -0,0 +1,155 @@
+"""
+The "imply" sheet of semi.xlsx lists pairs of a subvariety A and a variety C with A a subvariety of C.
+It is closed under transitivity, so it is the order of a lattice of varieties, and the results of
+the pairs depend on each other.
+
+For A < B < C, a model is in C but not in A if and only if it is either in C but not in B, or in
+B but not in A, so the minimum order of a model in C but not in A is
+    min_order(A, C) = min(min_order(A, B), min_order(B, C)).
+Hence the results of the covering pairs (those with no variety in between) settle all the other
+pairs, and a pair that has no small model bounds the pairs below it.
+
+The bounds on the minimum order of a pair are kept as (lower, upper): there is no model of order
+less than lower, and there is a model of order upper.  inf is used when there is no known model,
+and (inf, inf) means that the subvariety is the variety, i.e. there is no model at all.
+"""
+
+from math import inf
+
+
+def build_graph(implies):
+    """ builds the graph of the implications
+    Args:
+        implies (List[List[tuple]]): [subvariety, variety] for each row of the spreadsheet
+    Returns:
+        (dict): varieties above each subvariety, e.g. {(1, 1): {(2, 1), (2, 2), ...}, ...}
+    """
+    above = dict()
+    for subvariety, variety in implies:
+        above.setdefault(subvariety, set()).add(variety)
+    return above
+
+
+def triples(above):
+    """ all the chains A < B < C in the graph
+    Args:
+        above (dict): varieties above each subvariety
+    Returns:
+        (List[tuple]): list of (A, B, C)
+    """
+    return [(a, b, c) for a in above for b in above[a] for c in above.get(b, ()) if c in above[a]]
+
+
+def pairs_below(above):
+    """ the pairs whose results the bounds of each pair depend on: (A, B) and (B, C) for each
+        variety B between the subvariety A and the variety C
+    Args:
+        above (dict): varieties above each subvariety
+    Returns:
+        (dict): set of pairs below each pair (subvariety, variety), empty for the covering pairs
+    """
+    below = {(a, c): set() for a in above for c in above[a]}
+    for a, b, c in triples(above):
+        below[(a, c)].update(((a, b), (b, c)))
+    return below
+
+
+def heights(above):
+    """ the length of the longest chain between the subvariety and the variety of each pair.
+        Covering pairs have height 1.
+    Args:
+        above (dict): varieties above each subvariety
+    Returns:
+        (dict): height of each pair (subvariety, variety)
+    """
+    height = dict()
+
+    def longest(a, c):
+        if (a, c) not in height:
+            height[(a, c)] = 1 + max([longest(b, c) for b in above[a] if c in above.get(b, ())], default=0)
+        return height[(a, c)]
+
+    for a in above:
+        for c in above[a]:
+            longest(a, c)
+    return height
+
+
+def output_bounds(order, domain_size, holds=False):
+    """ the bounds on the minimum order given by one mace4 output. Mace4 goes through the domain
+        sizes in increasing order, so a model found is of the minimum order, and when no model is
+        found, all the domain sizes below the last one have been searched.
+    Args:
+        order (int): order of the model found, -1 if none
+        domain_size (int): last domain size searched, None if none
+        holds (bool): whether the prover showed that the implication holds
+    Returns:
+        (tuple): (lower, upper)
+    """
+    if holds:
+        return (inf, inf)
+    if order != -1:
+        return (order, order)
+    return (domain_size or 2, inf)
+
+
+def conjunction(bounds1, bounds2):
+    """ the bounds of a pair whose goal is split in two parts: a model in the variety but not in
+        the subvariety is one that breaks either part
+    Args:
+        bounds1 (tuple): (lower, upper) of the first part
+        bounds2 (tuple): (lower, upper) of the second part
+    """
+    return (min(bounds1[0], bounds2[0]), min(bounds1[1], bounds2[1]))
+
+
+def propagate(above, bounds):
+    """ tightens the bounds along all the chains of the graph until nothing changes
+    Args:
+        above (dict): varieties above each subvariety
+        bounds (dict): (lower, upper) for the pairs with known results
+    Returns:
+        (dict): (lower, upper) for all the pairs in the graph
+    """
+    result = {(a, c): bounds.get((a, c), (2, inf)) for a in above for c in above[a]}
+    chains = triples(above)
+    changed = True
+    while changed:
+        changed = False
+        for a, b, c in chains:
+            l_ab, u_ab = result[(a, b)]
+            l_bc, u_bc = result[(b, c)]
+            l_ac, u_ac = result[(a, c)]
+            # min_order(A, C) = min(min_order(A, B), min_order(B, C))
+            new_ac = (max(l_ac, min(l_ab, l_bc)), min(u_ac, u_ab, u_bc))
+            new_ab = (max(l_ab, l_ac), min(u_ab, u_ac) if l_bc > u_ac else u_ab)
+            new_bc = (max(l_bc, l_ac), min(u_bc, u_ac) if l_ab > u_ac else u_bc)
+            for pair, old, new in (((a, c), (l_ac, u_ac), new_ac), ((a, b), (l_ab, u_ab), new_ab),
+                                   ((b, c), (l_bc, u_bc), new_bc)):
+                if new != old:
+                    result[pair] = new
+                    changed = True
+    return result
+
+
+def decided(bounds):
+    """ whether the minimum order of a pair is known
+    Args:
+        bounds (tuple): (lower, upper)
+    """
+    return bounds[0] >= bounds[1]
+
+
+def describe(bounds):
+    """ comment for the report on what the lattice says about a pair
+    Args:
+        bounds (tuple): (lower, upper)
+    """
+    lower, upper = bounds
+    if lower == inf:
+        return "implication holds (from the lattice)"
+    if decided(bounds):
+        return f"found a model of order {upper} (from the lattice)"
+    if upper == inf:
+        return f"no model of order less than {lower} (from the lattice)"
+    return f"min order between {lower} and {upper} (from the lattice)"
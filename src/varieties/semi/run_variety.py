@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Run mace4 on all files (as inputs to Mace4) given in a directory, except for those
+that have successfully been run (i.e. models found) previously, as shown in the
+output files in a specific output directory.
+The runner is shared by all the pipelines, see varieties/runner.py.
+
+When the spreadsheet is also given, the rows are run in the order of the lattice of
+varieties: a row is started as soon as all the pairs below it in the lattice have finished,
+it is skipped when the results so far already settle it (see lattice.py), and otherwise
+mace4 starts from the lower bound the lattice gives on its min order (-n).
+The goals of a row split by the generator (gen_formulas.py --split-goals) are run together.
+"""
+import sys
+import os
+import time
+from math import inf
+from varieties import runner
+from varieties.mace4 import parse_output
+from varieties.semi import lattice
+from varieties.semi.gen_formulas import read_data
+
+
+output_bounds = dict()  # output file -> ((size, mtime in ns), (lower, upper) from the file)
+
+
+def read_bounds(output_dir, implies):
+    """ reads the bounds on the min orders of the rows that have been run. The bounds of each output
+        file are kept with its size and mtime, so that only the files changed since are parsed again.
+    Args:
+        output_dir (str): output directory
+        implies (List[List[tuple]]): [subvariety, variety] for each row of the spreadsheet
+    Returns:
+        (dict): (lower, upper) for each pair (subvariety, variety) that has an output file
+    """
+    bounds = dict()
+    for file in os.listdir(output_dir):
+        pair = tuple(implies[int(file.split("_")[0])-1])
+        stat = os.stat(os.path.join(output_dir, file))
+        cached = output_bounds.get(file, None)
+        if cached is not None and cached[0] == (stat.st_size, stat.st_mtime_ns):
+            goal_bounds = cached[1]
+        else:
+            order, domain_size, _, _, error, _ = parse_output(os.path.join(output_dir, file))
+            goal_bounds = lattice.output_bounds(order, domain_size, error == "implication holds")
+            output_bounds[file] = ((stat.st_size, stat.st_mtime_ns), goal_bounds)
+        bounds[pair] = lattice.conjunction(bounds[pair], goal_bounds) if pair in bounds else goal_bounds
+    return bounds
+
+
+def run_lattice(num_threads, excel_file, output_dir, inputs_dir):
+    """ runs the rows in the order of the lattice. A row is started as soon as all the pairs below it
+        have finished, unless the results so far settle it, and mace4 starts from the lower bound on
+        its min order.  The rows ready at the same time are started by height, then by row.
+    Args:
+        num_threads (int): number of mace4 to run at the same time
+        excel_file (str): full path name of the excel file containing the varieties and subvarieties
+        output_dir (str): output directory
+        inputs_dir (str): directory of the mace4 inputs files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    runner.solved_groups.clear()
+    output_bounds.clear()
+    bases, implies = read_data(excel_file)
+    above = lattice.build_graph(implies)
+    height = lattice.heights(above)
+    below = lattice.pairs_below(above)
+    input_files = dict()
+    for in_file in sorted(f for f in os.listdir(inputs_dir) if f.endswith(".in")):
+        input_files.setdefault(int(in_file.split("_")[0]), list()).append(in_file)
+    pair_of = {line_no: tuple(implies[line_no-1]) for line_no in input_files}
+    pending = sorted(input_files, key=lambda line_no: (height[pair_of[line_no]], line_no))
+    active = dict()     # line number -> threads running its files
+    bounds = None
+    while pending or active:
+        finished = [line_no for line_no, threads in active.items() if not any(t.is_alive() for t in threads)]
+        for line_no in finished:
+            del active[line_no]
+        if bounds is None or finished:
+            bounds = lattice.propagate(above, read_bounds(output_dir, implies))
+        busy = {pair_of[line_no] for line_no in pending + list(active)}
+        started = False
+        for line_no in [line_no for line_no in pending if not below[pair_of[line_no]] & busy]:
+            pair_bounds = bounds[pair_of[line_no]]
+            if not lattice.decided(pair_bounds):
+                if runner.thread_available(num_threads, runner.thread_slots) is None:
+                    break
+                lower = pair_bounds[0] if 2 < pair_bounds[0] < inf else None
+                active[line_no] = runner.run_process(num_threads, output_dir, inputs_dir, input_files[line_no], lower)
+                started = True
+            pending.remove(line_no)
+        if not started:
+            time.sleep(1)
+
+
+def main(argv):
+    # e.g. varieties run semi inputs outputs docs/semi.xlsx --threads 8
+    argv = runner.configure(argv)
+    if len(argv) > 2:
+        run_lattice(runner.max_threads, argv[2], argv[1], argv[0])
+    else:
+        runner.run_all(argv[0], argv[1])
+
+
+if __name__ == "__main__":
+    # e.g. ./src/varieties/semi/run_variety.py inputs outputs
+    main(sys.argv[1:])
@@ -0,0 +1,115 @@
+"""
+Checks of the canonical forms of the model catalogue (varieties/catalogue.py) against the known
+numbers of semigroups up to isomorphism and anti-isomorphism, and under relabelling.
+"""
+
+import itertools
+import random
+import time
+from varieties import catalogue
+
+
+def semigroups(n):
+    """ all the associative tables of order n, filled in entry by entry, backtracking as soon
+        as two entries already filled in break associativity
+    """
+    table = [None] * (n * n)
+
+    def associative_so_far():
+        for x, y, z in itertools.product(range(n), repeat=3):
+            xy, yz = table[x * n + y], table[y * n + z]
+            if xy is None or yz is None:
+                continue
+            left, right = table[xy * n + z], table[x * n + yz]
+            if left is not None and right is not None and left != right:
+                return False
+        return True
+
+    def fill(entry):
+        if entry == n * n:
+            yield bytes(table)
+            return
+        for v in range(n):
+            table[entry] = v
+            if associative_so_far():
+                yield from fill(entry + 1)
+        table[entry] = None
+
+    return fill(0)
+
+
+def classes(tables, n, anti=False):
+    return len({catalogue.canonical_key(n, table, anti)[0] for table in tables})
+
+
+def test_magmas_of_order_2():
+    assert classes([bytes(t) for t in itertools.product(range(2), repeat=4)], 2) == 10
+
+
+def test_semigroups_of_order_3():
+    tables = list(semigroups(3))
+    assert len(tables) == 113
+    assert classes(tables, 3) == 24
+    assert classes(tables, 3, anti=True) == 18
+
+
+def test_semigroups_of_order_4():
+    tables = list(semigroups(4))
+    assert len(tables) == 3492
+    assert classes(tables, 4) == 188
+    assert classes(tables, 4, anti=True) == 126
+
+
+def test_invariant_under_relabelling():
+    rng = random.Random(1)
+    for trial in range(400):
+        n = rng.randint(2, 10)
+        kind = trial % 4
+        if kind == 0:
+            table = bytes(rng.randrange(n) for _ in range(n * n))
+        elif kind == 1:
+            table = bytes((x + y) % n for x in range(n) for y in range(n))
+        elif kind == 2:
+            table = bytes(rng.randrange(2) if x < 2 and y < 2 else 0 for x in range(n) for y in range(n))
+        else:
+            k = rng.randint(1, n)
+            table = bytes(min(x, y) % k for x in range(n) for y in range(n))
+        labels = list(range(n))
+        rng.shuffle(labels)
+        assert catalogue.canonical_form(n, table) == catalogue.canonical_form(n, catalogue.relabel(n, table, labels))
+
+
+def test_anti_isomorphic_models_share_a_key():
+    left_zero = bytes(x for x in range(3) for y in range(3))
+    right_zero = catalogue.transpose(3, left_zero)
+    assert catalogue.canonical_key(3, left_zero)[0] != catalogue.canonical_key(3, right_zero)[0]
+    assert catalogue.canonical_key(3, left_zero, True)[0] == catalogue.canonical_key(3, right_zero, True)[0]
+
+
+def test_non_isomorphic_groups_differ():
+    cyclic = bytes((x + y) % 4 for x in range(4) for y in range(4))
+    klein = bytes(x ^ y for x in range(4) for y in range(4))
+    assert catalogue.canonical_form(4, cyclic) != catalogue.canonical_form(4, klein)
+
+
+def test_symmetric_tables_are_fast():
+    # the null semigroup of order n has n - 1 interchangeable elements, so without jumping back
+    # over subtrees equivalent to ones already searched the search takes exponential time
+    start = time.perf_counter()
+    assert len(set(catalogue.canonical_form(32, bytes(32 * 32)))) == 1
+    assert time.perf_counter() - start < 10
+
+
+def test_catalogue_file(tmp_path):
+    out_dir = tmp_path / "outputs"
+    out_dir.mkdir()
+    left_zero = "interpretation( 2, [number=1, seconds=0], [\n  function(*(_,_), [\n    0,0,\n    1,1 ])\n]).\n"
+    right_zero = "interpretation( 2, [number=1, seconds=0], [\n  function(*(_,_), [\n    0,1,\n    0,1 ])\n]).\n"
+    (out_dir / "0001_a.in.out").write_text(left_zero)
+    (out_dir / "0002_b.in.out").write_text(right_zero)
+    (out_dir / "0003_c.in.out").write_text("Exiting with failure.\n")
+    fn = str(tmp_path / "models.cat")
+    assert catalogue.build_catalogue([str(out_dir)], fn, anti=True) == (1, 2)
+    models, index, anti = catalogue.read_catalogue(fn)
+    assert anti and len(models) == 1 and set(index) == {"0001_a.in", "0002_b.in"}
+    assert index["0001_a.in"][1] != index["0002_b.in"][1]
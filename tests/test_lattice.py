@@ -0,0 +1,65 @@
+"""
+Checks of the bounds on the minimum orders along the chains A < B < C of the lattice of varieties
+(varieties/semi/lattice.py), with min_order(A, C) = min(min_order(A, B), min_order(B, C)).
+"""
+
+from math import inf
+from varieties.semi import lattice
+
+
+A, B, C, D = (1, 1), (2, 1), (3, 1), (4, 1)
+chain = lattice.build_graph([[A, B], [B, C], [A, C]])
+
+
+def test_covering_pairs_settle_the_longer_pair():
+    bounds = lattice.propagate(chain, {(A, B): (5, 5), (B, C): (3, 3)})
+    assert bounds[(A, C)] == (3, 3)
+    assert lattice.decided(bounds[(A, C)])
+
+
+def test_no_model_below_the_covering_pairs_bounds_the_longer_pair():
+    bounds = lattice.propagate(chain, {(A, B): (4, inf), (B, C): (6, inf)})
+    assert bounds[(A, C)] == (4, inf)
+    assert not lattice.decided(bounds[(A, C)])
+
+
+def test_implications_that_hold():
+    assert lattice.output_bounds(-1, None, holds=True) == (inf, inf)
+    bounds = lattice.propagate(chain, {(A, B): (inf, inf), (B, C): (inf, inf)})
+    assert bounds[(A, C)] == (inf, inf)
+    assert lattice.describe(bounds[(A, C)]) == "implication holds (from the lattice)"
+    bounds = lattice.propagate(chain, {(A, B): (inf, inf), (B, C): (4, 4)})
+    assert bounds[(A, C)] == (4, 4)
+
+
+def test_upper_bound_moves_down_to_the_other_pair():
+    # l_bc > u_ac: B -> C has no model of order less than 5 but A -> C has one of order 3,
+    # so that model must break A -> B
+    bounds = lattice.propagate(chain, {(A, C): (3, 3), (B, C): (5, inf)})
+    assert bounds[(A, B)] == (3, 3)
+    # and symmetrically for B -> C when l_ab > u_ac
+    bounds = lattice.propagate(chain, {(A, C): (3, 3), (A, B): (5, inf)})
+    assert bounds[(B, C)] == (3, 3)
+
+
+def test_upper_bound_stays_when_the_other_pair_may_have_the_model():
+    bounds = lattice.propagate(chain, {(A, C): (3, 3), (B, C): (2, inf)})
+    assert bounds[(A, B)] == (3, inf)
+
+
+def test_lower_bound_of_the_longer_pair_bounds_the_pairs_in_between():
+    bounds = lattice.propagate(chain, {(A, C): (4, inf)})
+    assert bounds[(A, B)] == (4, inf) and bounds[(B, C)] == (4, inf)
+
+
+def test_longer_chains():
+    above = lattice.build_graph([[A, B], [B, C], [C, D], [A, C], [B, D], [A, D]])
+    assert lattice.heights(above)[(A, D)] == 3
+    bounds = lattice.propagate(above, {(A, B): (5, 5), (B, C): (4, inf), (C, D): (6, 6)})
+    assert bounds[(A, D)] == (4, 5)
+    assert lattice.describe(bounds[(A, D)]) == "min order between 4 and 5 (from the lattice)"
+
+
+def test_split_goals():
+    assert lattice.conjunction((4, 4), lattice.output_bounds(-1, None)) == (2, 4)
+    assert lattice.conjunction((4, 4), (5, inf)) == (4, 4)
@@ -0,0 +1,116 @@
+"""
+Checks of the equational prover (varieties/prover.py) on known semigroup implications.
+A proof makes the runner skip mace4, so every implication the prover proves here is also
+checked against all the semigroups of order 2 and 3: none of them may break it.
+"""
+
+import itertools
+import pytest
+from varieties import prover
+from varieties.mace4 import sos_line, goal_line, end_line, associativity_str
+
+
+def write_problem(tmp_path, sos, goals):
+    fn = tmp_path / "problem.in"
+    fn.write_text("".join([sos_line, associativity_str] + [f"{identity}.\n" for identity in sos]
+                          + [end_line, goal_line] + [f"{goal}.\n" for goal in goals] + [end_line]))
+    return str(fn)
+
+
+def semigroups(n):
+    for table in itertools.product(range(n), repeat=n * n):
+        if all(table[table[x * n + y] * n + z] == table[x * n + table[y * n + z]]
+               for x in range(n) for y in range(n) for z in range(n)):
+            yield table
+
+
+def value(n, table, word, assignment):
+    result = assignment[word[0]]
+    for symbol in word[1:]:
+        result = table[result * n + assignment[symbol]]
+    return result
+
+
+def holds(n, table, equation):
+    left, right = equation
+    symbols = sorted(set(left + right))
+    return all(value(n, table, left, assignment) == value(n, table, right, assignment)
+               for values in itertools.product(range(n), repeat=len(symbols))
+               for assignment in [dict(zip(symbols, values))])
+
+
+def countermodel(sos, goals):
+    """ a semigroup of order 2 or 3 that satisfies the sos but not one of the goals, or None """
+    sos = [prover.parse_equation(identity) for identity in sos]
+    goals = [prover.parse_equation(goal) for goal in goals]
+    for n in (2, 3):
+        for table in semigroups(n):
+            if all(holds(n, table, identity) for identity in sos) and not all(holds(n, table, goal) for goal in goals):
+                return (n, table)
+    return None
+
+
+true_implications = [
+    (["x * y = y * x"], ["x * y * z = z * y * x"]),
+    (["x * x = x", "x * y = y * x"], ["x * y * x = x * y"]),
+    (["x * y * x = x"], ["x * x * x = x"]),
+    (["x * y = x"], ["x * y * z = x * z"]),
+    (["x * y = y"], ["x * y * z = z"]),
+    (["x * y * z = x * z"], ["x * y * z * w = x * w"]),
+    (["x * x = x", "x * y * z = x * z * y"], ["x * y * x * y = x * y"]),
+    (["x * y = y * x"], ["x * y = y * x", "x * y * z = y * x * z"]),
+]
+
+false_implications = [
+    (["x * y = y * x"], ["x * x = x"]),
+    (["x * x = x"], ["x * y = y * x"]),
+    (["x * y * x = x"], ["x * y = y * x"]),
+    (["x * y = y"], ["x * y = x"]),
+    (["x * y = y * x"], ["x = y"]),
+    (["x * y = y"], ["x = y"]),
+    (["x * x = x"], ["x * y * z = x * z"]),
+]
+
+
+@pytest.mark.parametrize("sos, goals", true_implications)
+def test_proves_true_implications(tmp_path, sos, goals):
+    proof = prover.prove(write_problem(tmp_path, sos, goals))
+    assert proof is not None
+    assert [line for line in proof if line.startswith("Goal:")] == [f"Goal: {goal}" for goal in goals]
+    assert countermodel(sos, goals) is None
+
+
+@pytest.mark.parametrize("sos, goals", false_implications)
+def test_never_proves_false_implications(tmp_path, sos, goals):
+    assert countermodel(sos, goals) is not None
+    assert prover.prove(write_problem(tmp_path, sos, goals)) is None
+
+
+@pytest.mark.parametrize("sos, goals", [
+    (["x * y = y * x | x * x = x"], ["x * x * x = x"]),
+    (["x * y = y * x"], ["x * y * z = z * y * x | x = y"]),
+    (["x * y != y * x"], ["x * x = x"]),
+    (["x * y = y * x"], ["x * x != x"]),
+    (["-(x * y = y * x)"], ["x * x = x"]),
+    (["x * y = y * x"], ["-(x * x = x)"]),
+    (["x' * x = x"], ["x * x = x"]),
+    (["f(x) = x"], ["x * x = x"]),
+])
+def test_rejects_unsupported_formulas(tmp_path, sos, goals):
+    assert prover.read_problem(write_problem(tmp_path, sos, goals)) is None
+    assert prover.prove(write_problem(tmp_path, sos, goals)) is None
+
+
+def test_needs_associativity(tmp_path):
+    fn = tmp_path / "problem.in"
+    fn.write_text("".join([sos_line, "x * y = y * x.\n", end_line, goal_line, "x * y * z = z * y * x.\n", end_line]))
+    assert prover.prove(str(fn)) is None
+
+
+def test_proof_steps_follow_the_sos():
+    rules = prover.rules_of([(("x", "y"), ("y", "x"))])
+    proof = prover.prove_goal((("a", "b", "c"), ("c", "b", "a")), rules, float("inf"))
+    words = [line.split("    by")[0].lstrip(" =").split(" * ") for line in proof]
+    assert words[0] == ["a", "b", "c"] and words[-1] == ["c", "b", "a"]
+    for word, next_word in zip(words, words[1:]):
+        assert sorted(word) == sorted(next_word) and word != next_word
@@ -0,0 +1,57 @@
+"""
+Checks of the runner (varieties/runner.py) with a fake mace4 on the PATH, which finds a model of
+order 4 for the first goal of a split row, and searches the other goals up to order 3 only.
+"""
+
+import os
+from varieties import runner
+from varieties.semi.collect import extract_all_data, merge_goals
+
+
+fake_mace4 = """#!/bin/sh
+for f; do :; done
+echo "============================== Mace4 ==="
+echo "For domain size 2."
+echo "Current CPU time: 0.00 seconds (total CPU time: 0.01 seconds)."
+echo "For domain size 3."
+echo "Current CPU time: 0.00 seconds (total CPU time: 0.02 seconds)."
+case "$f" in
+  *.g1.in)
+    echo "For domain size 4."
+    echo "Current CPU time: 0.00 seconds (total CPU time: 0.03 seconds)."
+    echo "interpretation( 4, [number=1, seconds=0], ["
+    echo "Exiting with 1 model."
+    echo "Process 1 exit (max_models) Mon Oct 19 00:00:00 2026";;
+  *)
+    echo "Process 1 exit (max_sec_no) Mon Oct 19 00:00:00 2026";;
+esac
+"""
+
+
+def run_split_row(tmp_path, monkeypatch, goals):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "mace4").write_text(fake_mace4)
+    (bin_dir / "mace4").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    inputs_dir = tmp_path / "inputs"
+    inputs_dir.mkdir()
+    for k in range(1, goals + 1):
+        (inputs_dir / f"0229_2_1_implies_3_1.g{k}.in").write_text("")
+    runner.configure(["--threads", "1", "--no-pin", "--no-prover"])
+    runner.run_all(str(inputs_dir), str(tmp_path / "outputs"))
+    return tmp_path / "outputs"
+
+
+def test_skipped_goals_get_an_output(tmp_path, monkeypatch):
+    outputs_dir = run_split_row(tmp_path, monkeypatch, 3)
+    assert sorted(os.listdir(outputs_dir)) == [f"0229_2_1_implies_3_1.g{k}.in.out" for k in (1, 2, 3)]
+    assert (outputs_dir / "0229_2_1_implies_3_1.g2.in.out").read_text() == runner.stopped_line
+
+
+def test_model_of_a_raced_row_is_only_a_bound(tmp_path, monkeypatch):
+    outputs_dir = run_split_row(tmp_path, monkeypatch, 2)
+    rows = merge_goals(extract_all_data(str(outputs_dir)))
+    assert len(rows) == 1
+    assert rows[0][3] is None
+    assert rows[0][6] == "model of order 4; orders 2 to 3 not excluded (1 of 2 goals)"